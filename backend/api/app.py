@@ -283,6 +283,13 @@ async def lifespan(app: FastAPI):
             await broadcast_service.stop_device_monitoring()
             logger.info(get_log_message('broadcast', 'service_stopped', component='app.shutdown'))
         
+        # Close the shared geolocation HTTP session
+        try:
+            from backend.services.ip_geolocation_service import IPGeolocationService
+            await IPGeolocationService.close_shared_session()
+        except Exception as e:
+            logger.warning(f"Failed to close geolocation HTTP session: {e}")
+        
         # Close database service
         if enable_database and database_service:
             await database_service.close()
@@ -178,9 +178,8 @@ async def get_experiment_location_statistics(
         
         # Use the geographical location service to get the statistics
         from backend.services.ip_geolocation_service import IPGeolocationService
-        geolocation_service = IPGeolocationService(db_manager)
-        
-        stats = await geolocation_service.get_location_statistics(experiment_id)
+        async with IPGeolocationService(db_manager) as geolocation_service:
+            stats = await geolocation_service.get_location_statistics(experiment_id)
         
         logger.info(f"Successfully retrieved location statistics for experiment {experiment_id}: "
                    f"{stats['total_unique_ips']} unique IPs, {stats['location_coverage']:.1f}% coverage")
@@ -237,7 +236,7 @@ async def refresh_experiment_location_cache(
         WHERE experiment_id = $1 
         AND dst_ip IS NOT NULL 
         AND dst_ip != '0.0.0.0'::inet
-        AND NOT (HOST(dst_ip) LIKE '192.168.%' OR HOST(dst_ip) LIKE '10.%' OR HOST(dst_ip) LIKE '172.%')
+        AND NOT (dst_ip << inet '10.0.0.0/8' OR dst_ip << inet '172.16.0.0/12' OR dst_ip << inet '192.168.0.0/16')
         """
         
         result = await db_manager.execute_query(query, (experiment_id,))
@@ -265,6 +264,7 @@ async def refresh_experiment_location_cache(
             WHERE ip_address = ANY($1)
             """
             await db_manager.execute_command(delete_query, (unique_ips,))
+            IPGeolocationService.evict_memory_cache(unique_ips)
             logger.info(f"Cleared existing cache for {len(unique_ips)} IPs")
         
         # Batch get geographical location information (this will automatically update the cache)
@@ -274,10 +274,14 @@ async def refresh_experiment_location_cache(
             
             async def do_refresh():
                 try:
-                    locations = await geolocation_service.bulk_get_locations(unique_ips)
+                    async with geolocation_service:
+                        locations = await geolocation_service.bulk_get_locations(unique_ips)
                     logger.info(f"Refreshed location cache: {len(locations)} IPs located out of {len(unique_ips)}")
                 except Exception as e:
                     logger.error(f"Error in background refresh task: {e}")
+                finally:
+                    # This loop is closed afterwards; do not leave its HTTP session open
+                    await IPGeolocationService.close_shared_session()
             
             # Run the asynchronous task
             loop = asyncio.new_event_loop()
@@ -153,13 +153,55 @@ class ConnectionHandler:
             
             # Configurable send timeout
             message_text = json.dumps(enhanced_message)
+        except Exception as e:
+            return self._handle_send_error(e)
+        
+        return await self._send_text(message_text, message.get('type', 'unknown'))
+    
+    async def send_raw_message(self, message_text: str, message_size: Optional[int] = None,
+                               message_depth: Optional[int] = None) -> bool:
+        """
+        Send an already JSON-encoded message object as-is
+        
+        The text is not decoded, so one encoded frame can be shared by many connections;
+        the caller includes the connection ID when needed. Callers sharing a frame can pass
+        its UTF-8 size and dict depth so the size and depth checks skip re-measuring it.
+        """
+        if not self.is_active:
+            return False
+        
+        try:
+            if self.validate_message_format:
+                if self.enable_size_validation:
+                    if message_size is None:
+                        message_size = len(message_text.encode('utf-8'))
+                    if message_size > self.max_message_size:
+                        if self.log_errors:
+                            logger.warning(get_log_message('connection_handler', 'message_too_large',
+                                                         component='connection_handler.validation',
+                                                         connection_id=self.connection_id, size=message_size))
+                        return False
+                
+                if self.validate_json_structure:
+                    if message_depth is None:
+                        message_depth = self._get_dict_depth(json.loads(message_text))
+                    if message_depth > self.max_json_depth:
+                        return False
+        except Exception as e:
+            return self._handle_send_error(e)
+        
+        return await self._send_text(message_text, 'raw')
+    
+    async def _send_text(self, message_text: str, message_type: str) -> bool:
+        """Send encoded text with the configured timeout"""
+        try:
             await asyncio.wait_for(
                 self.websocket.send_text(message_text),
                 timeout=self.send_timeout
             )
             
             if self.log_messages:
-                logger.debug(f"Message sent to {self.connection_id}: {message.get('type', 'unknown')}")
+                logger.debug(f"Message sent to {self.connection_id}: {message_type}")
             
             return True
             
@@ -169,14 +211,18 @@ class ConnectionHandler:
             self.is_active = False
             return False
         except Exception as e:
-            if self.log_errors:
-                logger.error(get_log_message('connection_handler', 'send_message_failed',
-                                           component='connection_handler.send',
-                                           connection_id=self.connection_id, error=str(e)))
-            self.is_active = False
-            if self.auto_close_on_error:
-                self.close_connection()
-            return False
+            return self._handle_send_error(e)
+    
+    def _handle_send_error(self, e: Exception) -> bool:
+        """Record a send failure and deactivate the connection"""
+        if self.log_errors:
+            logger.error(get_log_message('connection_handler', 'send_message_failed',
+                                       component='connection_handler.send',
+                                       connection_id=self.connection_id, error=str(e)))
+        self.is_active = False
+        if self.auto_close_on_error:
+            self.close_connection()
+        return False
     
     def _validate_outgoing_message(self, message: Dict[str, Any]) -> bool:
         """Outgoing message validation"""
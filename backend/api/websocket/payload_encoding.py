@@ -0,0 +1,28 @@
+"""
+WebSocket payload encoding
+Shared JSON encoder for payloads handed to the raw broadcast path (orjson when available)
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+
+def isoformat_default(obj: Any) -> Any:
+    """Fallback encoding date/datetime values as ISO strings"""
+    if hasattr(obj, 'isoformat'):  # datetime object
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:
+    import orjson
+
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def encode_payload(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        """Encode a broadcast payload to JSON text (orjson, datetimes encoded natively)"""
+        return orjson.dumps(obj, default=default or isoformat_default, option=_ORJSON_OPTIONS).decode()
+except ImportError:
+    def encode_payload(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+        """Encode a broadcast payload to JSON text"""
+        return json.dumps(obj, default=default or isoformat_default)
@@ -6,8 +6,9 @@ Unified system for managing WebSocket connections, subscriptions, and message br
 import asyncio
 import json
 import logging
+import re
 import sys
-from typing import Dict, List, Set, Optional, Any
+from typing import Dict, List, Set, Optional, Any, Tuple
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 from pathlib import Path
@@ -32,6 +33,39 @@ from .message_handler import MessageHandler
 
 logger = logging.getLogger(__name__)
 
+# Strings (with escapes) are skipped whole, so braces inside them are ignored
+_JSON_STRUCTURE_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+
+def _json_dict_depth(payload_json: str) -> int:
+    """
+    Dict nesting depth of an encoded payload once wrapped as a message's "data"
+    
+    Mirrors ConnectionHandler._get_dict_depth on the decoded message: only dicts
+    reached through dict values count, dicts inside lists are not visited.
+    """
+    # Each entry: counted depth of an open dict, or None for lists and what they contain
+    stack: List[Optional[int]] = []
+    max_depth = 0
+    for match in _JSON_STRUCTURE_RE.finditer(payload_json):
+        token = match.group()
+        if token == '{':
+            if not stack:
+                depth = 1
+            elif stack[-1] is None:
+                depth = None
+            else:
+                depth = stack[-1] + 1
+            stack.append(depth)
+            if depth is not None and depth > max_depth:
+                max_depth = depth
+        elif token == '[':
+            stack.append(None)
+        elif token in '}]':
+            if stack:
+                stack.pop()
+    return max_depth
+
 class WebSocketManager:
     """WebSocket connection manager"""
     
@@ -456,6 +490,112 @@ class WebSocketManager:
                                        topic=message.get("topic", "unknown"),
                                        subscriber_count=successful_sends))
     
+    async def broadcast_to_topic_raw(self, topic: str, payload_json: str):
+        """Broadcast an already JSON-encoded payload to a topic"""
+        await self.broadcast_many_raw([(topic, payload_json)])
+    
+    async def broadcast_many_raw(self, updates: List[Tuple[str, str]]):
+        """
+        Broadcast several pre-encoded topic updates, iterating the subscriber set once
+        
+        Each frame is built once per topic and shared by all subscribers; only the
+        optional connection ID is appended per connection. A failed frame removes the
+        connection from that frame's topic only, as separate broadcasts would.
+        """
+        timestamp = datetime.now().isoformat()
+        pending: Dict[str, List[Tuple[str, str, int, int]]] = {}
+        subscriber_counts: Dict[str, int] = {}
+        
+        # Group frames per connection so each client is visited once
+        for topic, payload_json in updates:
+            subscribers = self.topic_subscribers.get(topic)
+            if not subscribers:
+                if self.log_broadcasts:
+                    logger.debug(get_log_message('websocket', 'no_subscribers',
+                                               component='websocket.broadcast',
+                                               topic=topic))
+                continue
+            
+            frame_head = self._encode_data_update_frame_head(topic, payload_json, timestamp)
+            # Size and depth are measured once per topic and checked per connection
+            queued = (topic, frame_head, len(frame_head.encode('utf-8')), _json_dict_depth(payload_json))
+            for connection_id in subscribers:
+                pending.setdefault(connection_id, []).append(queued)
+            subscriber_counts[topic] = len(subscribers)
+        
+        if not pending:
+            return
+        
+        connection_ids = list(pending)
+        failed: Dict[str, List[str]] = {}
+        
+        if self.batch_broadcast and len(connection_ids) > self.batch_size:
+            for i in range(0, len(connection_ids), self.batch_size):
+                batch = connection_ids[i:i + self.batch_size]
+                try:
+                    await asyncio.wait_for(
+                        self._send_frames_to_batch(batch, pending, failed),
+                        timeout=self.broadcast_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(get_log_message('websocket', 'performance_warning',
+                                                 component='websocket.broadcast',
+                                                 message=f"Batch broadcast timeout for {len(batch)} connections"))
+        else:
+            await self._send_frames_to_batch(connection_ids, pending, failed)
+        
+        # Clean up failed connections, per topic
+        if self.enable_connection_cleanup:
+            for connection_id, failed_topics in failed.items():
+                for topic in failed_topics:
+                    await self._remove_from_topic(connection_id, topic)
+        
+        for topic, subscriber_count in subscriber_counts.items():
+            if self.log_broadcasts:
+                logger.info(get_log_message('websocket', 'broadcast_topic_success',
+                                           component='websocket.broadcast',
+                                           topic=topic,
+                                           subscriber_count=subscriber_count))
+            if self.log_performance_stats:
+                self._log_broadcast_stats(topic, subscriber_count)
+    
+    def _encode_data_update_frame_head(self, topic: str, payload_json: str, timestamp: str) -> str:
+        """Wrap an encoded payload in an unterminated data_update message without re-encoding it"""
+        return (f'{{"type": "data_update", "topic": {json.dumps(topic)}, '
+                f'"data": {payload_json}, "timestamp": "{timestamp}"')
+    
+    async def _send_frames_to_batch(self, connection_ids: List[str],
+                                    pending: Dict[str, List[Tuple[str, str, int, int]]],
+                                    failed: Dict[str, List[str]]):
+        """Send queued frames to a batch of connections, recording failed topics per connection"""
+        results = await asyncio.gather(
+            *(self._send_frames(connection_id, pending[connection_id]) for connection_id in connection_ids),
+            return_exceptions=True
+        )
+        for connection_id, result in zip(connection_ids, results):
+            if isinstance(result, BaseException):
+                failed[connection_id] = [topic for topic, _, _, _ in pending[connection_id]]
+            elif result:
+                failed[connection_id] = result
+    
+    async def _send_frames(self, connection_id: str, frames: List[Tuple[str, str, int, int]]) -> List[str]:
+        """Send queued frames to one connection in order, returning the topics that failed"""
+        connection = self.connections.get(connection_id)
+        if connection is None:
+            return [topic for topic, _, _, _ in frames]
+        
+        # The per-connection tail is plain ASCII, so its length is its UTF-8 size
+        if connection.include_connection_id:
+            tail = f', "connection_id": "{connection.connection_id}"}}'
+        else:
+            tail = '}'
+        
+        failed_topics = []
+        for topic, frame_head, head_size, depth in frames:
+            if not await connection.send_raw_message(frame_head + tail, head_size + len(tail), depth):
+                failed_topics.append(topic)
+        return failed_topics
+    
     def _log_broadcast_stats(self, topic: str, subscriber_count: int):
         """Log broadcast statistics"""
         if subscriber_count > 100:  # Log performance warning when there are many connections
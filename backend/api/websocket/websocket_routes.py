@@ -128,7 +128,7 @@ class ConfigurableWebSocketHandler:
     async def handle_websocket_connection(self, websocket: WebSocket, route_name: str = "connect", topic: Optional[str] = None):
         """WebSocket connection handling"""
         connection_id = None
-        start_time = asyncio.get_event_loop().time() if self.enable_performance_monitoring else None
+        start_time = asyncio.get_running_loop().time() if self.enable_performance_monitoring else None
         
         try:
             # Get WebSocket manager
@@ -297,7 +297,7 @@ class ConfigurableWebSocketHandler:
                 
                 # Performance monitoring logs
                 if self.enable_performance_monitoring and start_time:
-                    duration = asyncio.get_event_loop().time() - start_time
+                    duration = asyncio.get_running_loop().time() - start_time
                     if self.log_performance_metrics:
                         logger.info(f"Connection {connection_id} duration: {duration:.2f}s")
                 
@@ -222,7 +222,8 @@ class SankeyFlowAnalyzer:
                 # Filter result to only keep top IPs
                 result = [row for row in result if row['dst_ip'] in unique_ips]
             
-            locations = await geolocation_service.bulk_get_locations(unique_ips)
+            async with geolocation_service:
+                locations = await geolocation_service.bulk_get_locations(unique_ips)
             
             # Build nodes and links
             nodes = []
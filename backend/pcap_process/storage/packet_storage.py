@@ -26,6 +26,13 @@ from pcap_process.analyzers.modular_data_analyzer import ModularDataAnalyzer
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj):
+    """Payload encoding fallback: ISO strings for date/datetime values, str() for anything else"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
 class PacketStorage:
     """
     Storage layer for packet flows
@@ -651,6 +658,7 @@ class PacketStorage:
         try:
             # Import WebSocket manager
             from backend.api.websocket.manager_singleton import get_websocket_manager
+            from backend.api.websocket.payload_encoding import encode_payload
             from backend.api.common.dependencies import get_database_service_instance
             
             # Get WebSocket manager instance
@@ -665,16 +673,15 @@ class PacketStorage:
             # Use default time window for analysis data
             time_window = "auto"
             
-            # Get all device analysis data and broadcast each type
-            tasks = []
+            # Get all device analysis data, encoding each payload once for all subscribers
+            updates = []
             
             # Device detail
             try:
                 device_detail = await database_service.get_device_detail(device_id, experiment_id)
                 if device_detail:
-                    serializable_data = self._serialize_datetime_objects(device_detail)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.detail", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.detail", encode_payload(device_detail, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Device detail broadcast failed: {e}")
@@ -683,9 +690,8 @@ class PacketStorage:
             try:
                 port_data = await database_service.get_device_port_analysis(device_id, experiment_id, time_window)
                 if port_data:
-                    serializable_data = self._serialize_datetime_objects(port_data)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.port-analysis", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.port-analysis", encode_payload(port_data, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Port analysis broadcast failed: {e}")
@@ -694,9 +700,8 @@ class PacketStorage:
             try:
                 protocol_data = await database_service.get_device_protocol_distribution(device_id, experiment_id, time_window)
                 if protocol_data:
-                    serializable_data = self._serialize_datetime_objects(protocol_data)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.protocol-distribution", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.protocol-distribution", encode_payload(protocol_data, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Protocol distribution broadcast failed: {e}")
@@ -705,9 +710,8 @@ class PacketStorage:
             try:
                 traffic_data = await database_service.get_device_traffic_trend(device_id, experiment_id, time_window)
                 if traffic_data:
-                    serializable_data = self._serialize_datetime_objects(traffic_data)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.traffic-trend", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.traffic-trend", encode_payload(traffic_data, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Traffic trend broadcast failed: {e}")
@@ -716,9 +720,8 @@ class PacketStorage:
             try:
                 topology_data = await database_service.get_device_network_topology(device_id, experiment_id, time_window)
                 if topology_data:
-                    serializable_data = self._serialize_datetime_objects(topology_data)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.network-topology", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.network-topology", encode_payload(topology_data, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Network topology broadcast failed: {e}")
@@ -727,36 +730,20 @@ class PacketStorage:
             try:
                 activity_data = await database_service.get_device_activity_timeline(device_id, experiment_id, time_window)
                 if activity_data:
-                    serializable_data = self._serialize_datetime_objects(activity_data)
-                    tasks.append(websocket_manager.broadcast_to_topic(
-                        f"devices.{device_id}.activity-timeline", serializable_data
+                    updates.append((
+                        f"devices.{device_id}.activity-timeline", encode_payload(activity_data, _json_default)
                     ))
             except Exception as e:
                 logger.debug(f"Activity timeline broadcast failed: {e}")
             
-            # Execute all broadcasts concurrently
-            if tasks:
-                import asyncio
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # Send all updates in one pass over the subscribers
+            if updates:
+                await websocket_manager.broadcast_many_raw(updates)
                 logger.info(f"Device analysis updates broadcasted for device {device_id}")
             
         except Exception as e:
             logger.warning(f"Failed to broadcast device updates: {e}")
     
-    def _serialize_datetime_objects(self, data):
-        """Serialize datetime objects to strings for JSON compatibility"""
-        import json
-        from datetime import datetime, date
-        
-        def default_serializer(obj):
-            if isinstance(obj, (datetime, date)):
-                return obj.isoformat()
-            elif hasattr(obj, 'isoformat'):
-                return obj.isoformat()
-            return str(obj)
-        
-        return json.loads(json.dumps(data, default=default_serializer))
-
     async def cleanup(self):
         """Cleanup storage resources"""
         self.device_cache.clear()
@@ -4,14 +4,24 @@ Intelligent file processing component of IoT device monitoring system
 """
 
 import asyncio
+import aiofiles
+import functools
 import logging
+import logging.handlers
+import os
+import queue
+import re
 import sys
 import shutil
 from pathlib import Path
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Callable
+from datetime import date, datetime, timezone, timedelta
+from typing import Dict, List, Optional, Callable, Tuple
 import json
 import time
+import weakref
+import pytz
+from collections import OrderedDict
+from types import SimpleNamespace
 
 # Add configuration path
 current_dir = Path(__file__).resolve().parent
@@ -31,6 +41,7 @@ from config.unified_config_manager import UnifiedConfigManager, get_config, get_
 from backend.pcap_process.core.engine import PcapProcessingEngine
 from backend.pcap_process.core.config import ProcessingConfig
 from database.connection import PostgreSQLDatabaseManager
+from backend.api.websocket.payload_encoding import encode_payload
 
 # Initialize the file_monitor logger and reconfigure it during the initialization of the FileMonitorService
 logger = logging.getLogger('file_monitor')
@@ -38,6 +49,102 @@ logger = logging.getLogger('file_monitor')
 # Create configuration manager instance
 config_manager = UnifiedConfigManager()
 
+# Background listener writing queued file monitor records to disk
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+# Local timezone resolved once per process (tzlocal reads /etc/localtime)
+try:
+    import tzlocal
+    _LOCAL_TZ = tzlocal.get_localzone()
+except ImportError:
+    _LOCAL_TZ = timezone.utc
+try:
+    # pytz equivalent for the scheduler's localize/normalize API
+    _LOCAL_PYTZ = pytz.timezone(str(_LOCAL_TZ))
+except pytz.UnknownTimeZoneError:
+    _LOCAL_PYTZ = pytz.utc
+
+# Common MAC address formats in capture filenames: separated (group 1) or bare hex (group 2)
+_MAC_RE = re.compile(r'([0-9A-Fa-f]{2}(?:[:-][0-9A-Fa-f]{2}){5})|([0-9A-Fa-f]{12})')
+
+# Lazy %-style templates for hot per-file log sites (formatted only when emitted)
+_LOG_QUEUED = "Queued file for processing: %s"
+_LOG_PROCESSING = "Processing file from queue: %s"
+_LOG_PROCESSING_START = "Starting file processing: %s"
+_LOG_PROCESSING_OK = "File processing successful: %s"
+_LOG_PROCESSING_FAILED = "File processing failed: %s"
+_LOG_FILE_MISSING = "File no longer exists: %s"
+_LOG_DELETED = "Deleted processed file: %s"
+_LOG_DELETED_FAILED = "Deleted failed file: %s"
+_LOG_QUEUE_FAILED = "Failed to queue file %s: %s"
+
+
+def _stop_log_listener():
+    """Flush and stop the file monitor log listener, closing its file handler"""
+    global _log_listener
+    if _log_listener is None:
+        return
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    _log_listener = None
+
+
+def _iter_files(directory: str, recursive: bool = True, skip_hidden_dirs: bool = False):
+    """
+    Yield DirEntry objects for regular files under a directory
+    
+    Uses os.scandir so file/directory checks come from the directory listing
+    instead of a stat call per entry. Symlinked directories are not followed.
+    """
+    pending = [directory]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and not (skip_hidden_dirs and entry.name.startswith('.')):
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+
+# Sentinel distinguishing "key not configured" from configured falsy values
+_CFG_MISS = object()
+
+
+def _walk_and_filter(directory: str, name_match: Callable, recursive: bool = True,
+                     skip_hidden_dirs: bool = False) -> List[str]:
+    """Collect paths of files whose names pass the scan filter (run in a worker thread)"""
+    return [entry.path for entry in _iter_files(directory, recursive, skip_hidden_dirs)
+            if name_match(entry.name)]
+
+
+def _build_scan_name_re(extensions, ignore_hidden: bool, ignore_temp: bool) -> "re.Pattern":
+    """
+    Compile the scan filename filter into a single pattern
+    
+    Matches names with a supported extension, optionally rejecting hidden
+    (dot-prefixed) and temporary (.tmp/.temp) files.
+    """
+    if not extensions:
+        return re.compile(r'(?!)')
+    hidden = r'(?!\.)' if ignore_hidden else ''
+    temp = r'(?!.*\.(?:tmp|temp)$)' if ignore_temp else ''
+    suffixes = '|'.join(re.escape(ext) for ext in sorted(extensions))
+    return re.compile(f'{hidden}{temp}.+(?:{suffixes})$', re.IGNORECASE | re.DOTALL)
+
+
+def _get_config_with_fallback(key: str, component: str, fallback_key: str,
+                              fallback_component: str, default):
+    """Read a config key, consulting the legacy fallback key only when it is missing"""
+    value = get_config(key, _CFG_MISS, component)
+    if value is _CFG_MISS:
+        value = get_config(fallback_key, default, fallback_component)
+    return value
+
 class ScheduledPCAPScanner:
     """Configuration-based scheduled PCAP file scanner"""
     
@@ -51,20 +158,34 @@ class ScheduledPCAPScanner:
         """
         self.processor_callback = processor_callback
         self.config = file_monitor_config
-        self.processed_files = set()
+        
+        # Bounded LRU of processed file paths (OrderedDict used as an ordered set)
+        self.processed_files = OrderedDict()
+        self._processed_cap = get_config('file_monitor.processing.processed_files_cache_size', 
+                                         50000, 'file_monitor.processing')
         
         # Configuration-based queue initialization
         self.processing_queue = asyncio.Queue()
         if get_config('file_monitor.logging.log_queue_operations', False, 'file_monitor.logging'):
             logger.info(get_log_message('file_monitor', 'queue_reset', component='file_monitor.queue'))
         
-        # Configuration-based file extension support
-        self.supported_extensions = set(
-            get_config('file_monitoring.supported_extensions', 
-                      ['.pcap', '.pcapng', '.cap'], 
-                      'file_monitor.file_handling')
+        # Configuration-based file extension support (lowercase, matched against lowered suffixes)
+        self.supported_extensions = frozenset(
+            ext.lower() for ext in get_config('file_monitoring.supported_extensions', 
+                                              ['.pcap', '.pcapng', '.cap'], 
+                                              'file_monitor.file_handling')
         )
         
+        # Per-file scanning flags, read once per scanner instance
+        self._ignore_hidden = get_config('file_monitor.scanning.ignore_hidden_files', 
+                                         True, 'file_monitor.scanning')
+        self._ignore_temp = get_config('file_monitor.scanning.ignore_temp_files', 
+                                       True, 'file_monitor.scanning')
+        self._log_file_detection = get_config('file_monitor.logging.log_file_detection', 
+                                              True, 'file_monitor.logging')
+        self._scan_name_re = _build_scan_name_re(self.supported_extensions,
+                                                 self._ignore_hidden, self._ignore_temp)
+        
         # Configuration-based processing statistics
         self.processing_stats = {
             'files_detected': 0,
@@ -76,25 +197,19 @@ class ScheduledPCAPScanner:
         
         # Get scan schedule configuration
         # Try both config keys for compatibility
-        self.schedule_enabled = get_config('file_monitoring.schedule.enabled', 
-                                         get_config('file_monitor.schedule.enabled', True, 'file_monitor.schedule'), 
-                                         'file_monitoring.schedule')
-        self.scan_times = get_config('file_monitoring.schedule.scan_times', 
-                                   get_config('file_monitor.schedule.scan_times', 
-                                            ['06:00', '12:00', '18:00', '23:59'], 
-                                            'file_monitor.schedule'),
-                                   'file_monitoring.schedule')
-        self.timezone_str = get_config('file_monitoring.schedule.timezone', 
-                                     get_config('file_monitor.schedule.timezone', 'local', 'file_monitor.schedule'),
-                                     'file_monitoring.schedule')
+        self.schedule_enabled = _get_config_with_fallback('file_monitoring.schedule.enabled', 'file_monitoring.schedule',
+                                                          'file_monitor.schedule.enabled', 'file_monitor.schedule',
+                                                          True)
+        self.scan_times = _get_config_with_fallback('file_monitoring.schedule.scan_times', 'file_monitoring.schedule',
+                                                    'file_monitor.schedule.scan_times', 'file_monitor.schedule',
+                                                    ['06:00', '12:00', '18:00', '23:59'])
+        self.timezone_str = _get_config_with_fallback('file_monitoring.schedule.timezone', 'file_monitoring.schedule',
+                                                      'file_monitor.schedule.timezone', 'file_monitor.schedule',
+                                                      'local')
         
         # Setup timezone
-        import pytz
         if self.timezone_str == 'local':
-            import tzlocal
-            local_tz = tzlocal.get_localzone()
-            # Convert to pytz timezone for consistent API
-            self.timezone = pytz.timezone(str(local_tz))
+            self.timezone = _LOCAL_PYTZ
         else:
             self.timezone = pytz.timezone(self.timezone_str)
         
@@ -104,6 +219,13 @@ class ScheduledPCAPScanner:
                                    scan_times=self.scan_times,
                                    timezone=str(self.timezone)))
 
+    def _mark_processed(self, path_str: str):
+        """Record a processed file, evicting the least recently seen entry beyond the cap"""
+        self.processed_files[path_str] = None
+        self.processed_files.move_to_end(path_str)
+        if len(self.processed_files) > self._processed_cap:
+            self.processed_files.popitem(last=False)
+
     def _parse_scan_time(self, time_str: str) -> tuple:
         """Parse scan time string to hour and minute"""
         try:
@@ -184,6 +306,7 @@ class ScheduledPCAPScanner:
     async def _perform_scheduled_scan(self, monitor_directories: List[Path]):
         """Perform a scheduled scan of all monitored directories"""
         scan_start = datetime.now(self.timezone)
+        detected_time = scan_start.astimezone(timezone.utc)  # One detection time per scan batch
         logger.info(f"Starting scheduled scan at {scan_start.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         
         total_files = 0
@@ -191,10 +314,8 @@ class ScheduledPCAPScanner:
         already_processed = 0
         
         # Configuration-based scanning settings
-        ignore_hidden = get_config('file_monitor.scanning.ignore_hidden_files', 
-                                 True, 'file_monitor.scanning')
-        ignore_temp = get_config('file_monitor.scanning.ignore_temp_files', 
-                               True, 'file_monitor.scanning')
+        ignore_hidden = self._ignore_hidden
+        scan_name_match = self._scan_name_re.match
         
         for monitor_dir in monitor_directories:
             logger.info(f"Scanning directory: {monitor_dir}")
@@ -203,51 +324,40 @@ class ScheduledPCAPScanner:
                 logger.warning(f"Directory not exists: {monitor_dir}")
                 continue
             
-            # Recursive scan of all subdirectories
-            for file_path in monitor_dir.rglob("*"):
-                if not file_path.is_file():
-                    continue
-                
-                # Check file extension
-                if file_path.suffix.lower() not in self.supported_extensions:
-                    continue
-                
-                # Configuration-based file filtering
-                if ignore_hidden and file_path.name.startswith('.'):
-                    continue
-                
-                if ignore_temp and (file_path.name.endswith('.tmp') or file_path.name.endswith('.temp')):
-                    continue
-                
+            # Recursive scan of all subdirectories with configuration-based file filtering,
+            # walked in a worker thread so the event loop keeps serving the queue
+            candidates = await asyncio.to_thread(_walk_and_filter, str(monitor_dir), scan_name_match,
+                                                 True, ignore_hidden)
+            for path_str in candidates:
                 total_files += 1
                 
                 # Check if file was already processed
-                if str(file_path) in self.processed_files:
+                if path_str in self.processed_files:
                     already_processed += 1
                     continue
                 
                 # Queue file for processing
                 new_files += 1
-                await self._queue_file_for_processing(file_path)
+                await self._queue_file_for_processing(Path(path_str), detected_time)
         
         self.processing_stats['last_scan'] = scan_start
         
         logger.info(f"Scheduled scan completed: total={total_files}, new={new_files}, processed={already_processed}")
 
-    async def _queue_file_for_processing(self, file_path: Path):
-        """Add file to processing queue"""
+    async def _queue_file_for_processing(self, file_path: Path, detected_time: Optional[datetime] = None):
+        """Add file to processing queue (scans pass one detection time for the whole batch)"""
         try:
             await self.processing_queue.put({
                 'file_path': file_path,
-                'detected_time': datetime.now(timezone.utc),
+                'detected_time': detected_time or datetime.now(timezone.utc),
                 'retry_count': 0
             })
             
-            if get_config('file_monitor.logging.log_file_detection', True, 'file_monitor.logging'):
-                logger.info(f"Queued file for processing: {file_path}")
+            if self._log_file_detection:
+                logger.info(_LOG_QUEUED, file_path)
                 
         except Exception as e:
-            logger.error(f"Failed to queue file {file_path}: {e}")
+            logger.error(_LOG_QUEUE_FAILED, file_path, e)
 
     async def process_queue(self):
         """Configuration-based queue processing"""
@@ -267,19 +377,19 @@ class ScheduledPCAPScanner:
                 file_path = file_info['file_path']
                 
                 if get_config('file_monitor.logging.log_queue_operations', False, 'file_monitor.logging'):
-                    logger.info(f"Processing file from queue: {file_path}")
+                    logger.info(_LOG_PROCESSING, file_path)
                 
                 # Check if file still exists
                 if not file_path.exists():
-                    logger.warning(f"File no longer exists: {file_path}")
+                    logger.warning(_LOG_FILE_MISSING, file_path)
                     self.processing_queue.task_done()
                     continue
                 
                 if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                    logger.info(f"Starting file processing: {file_path}")
+                    logger.info(_LOG_PROCESSING_START, file_path)
                 
                 # Mark as being processed
-                self.processed_files.add(str(file_path))
+                self._mark_processed(str(file_path))
                 
                 # Call processing callback
                 success = await self.processor_callback(file_path, file_info)
@@ -289,17 +399,17 @@ class ScheduledPCAPScanner:
                     self.processing_stats['last_processed'] = datetime.now(timezone.utc)
                     
                     if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                        logger.info(f"File processing successful: {file_path}")
+                        logger.info(_LOG_PROCESSING_OK, file_path)
                     
                     # Delete processed file after successful processing
                     if file_path.exists():
                         file_path.unlink()
-                        logger.info(f"Deleted processed file: {file_path}")
+                        logger.info(_LOG_DELETED, file_path)
                 else:
                     self.processing_stats['files_failed'] += 1
                     
                     if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                        logger.error(f"File processing failed: {file_path}")
+                        logger.error(_LOG_PROCESSING_FAILED, file_path)
                     
                     # Handle retry logic
                     retry_count = file_info.get('retry_count', 0)
@@ -314,7 +424,7 @@ class ScheduledPCAPScanner:
                         keep_failed = get_config('file_monitoring.keep_failed_files', True, 'file_monitor.file_handling')
                         if not keep_failed and file_path.exists():
                             file_path.unlink()
-                            logger.info(f"Deleted failed file: {file_path}")
+                            logger.info(_LOG_DELETED_FAILED, file_path)
                 
                 self.processing_queue.task_done()
                 
@@ -504,15 +614,17 @@ class WebSocketBroadcastProtection:
     async def _execute_full_broadcast(self, experiment_id: str, device_id: str = None):
         """Execute full data broadcast"""
         try:
-            # Broadcast experiment detail update
-            await self._safe_broadcast_experiment_detail(experiment_id)
-            
-            # Broadcast experiment overview update
-            await self._safe_broadcast_experiments_overview()
+            # Experiment detail, experiment overview and device updates are independent
+            broadcasts = [
+                self._safe_broadcast_experiment_detail(experiment_id),
+                self._safe_broadcast_experiments_overview()
+            ]
             
             # Broadcast device updates (if device ID is provided)
             if device_id:
-                await self._safe_broadcast_device_updates(device_id, experiment_id)
+                broadcasts.append(self._safe_broadcast_device_updates(device_id, experiment_id))
+            
+            await asyncio.gather(*broadcasts, return_exceptions=True)
                 
         except Exception as e:
             logger.warning(get_log_message('file_monitor', 'full_broadcast_partial_failure', 
@@ -546,77 +658,50 @@ class WebSocketBroadcastProtection:
     
     async def _safe_broadcast_device_updates(self, device_id: str, experiment_id: str):
         """Safe broadcast device updates - all analysis data"""
+        # Use default time window for analysis data
+        time_window = "48h"  # Default time window for device analysis
+        db = self.database_service
+        
         try:
-            # Use default time window for analysis data
-            time_window = "48h"  # Default time window for device analysis
-            
-            # 1. Device detail
-            device_detail = await self.database_service.get_device_detail(device_id, experiment_id, time_window)
-            if device_detail:
-                serializable_data = self._serialize_datetime_objects(device_detail)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.detail",
-                    serializable_data
-                )
-            
-            # 2. Port analysis
-            port_analysis = await self.database_service.get_device_port_analysis(device_id, time_window, experiment_id)
-            if port_analysis:
-                serializable_data = self._serialize_datetime_objects(port_analysis)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.port-analysis",
-                    serializable_data
-                )
-            
-            # 3. Protocol distribution
-            protocol_distribution = await self.database_service.get_device_protocol_distribution(device_id, time_window, experiment_id)
-            if protocol_distribution:
-                serializable_data = self._serialize_datetime_objects(protocol_distribution)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.protocol-distribution",
-                    serializable_data
-                )
-            
-            # 4. Traffic trend
-            traffic_trend = await self.database_service.get_device_traffic_trend(device_id, time_window, experiment_id)
-            if traffic_trend:
-                serializable_data = self._serialize_datetime_objects(traffic_trend)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.traffic-trend",
-                    serializable_data
-                )
-            
-            # 5. Network topology
-            network_topology = await self.database_service.get_device_network_topology(device_id, time_window, experiment_id)
-            if network_topology:
-                serializable_data = self._serialize_datetime_objects(network_topology)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.network-topology",
-                    serializable_data
-                )
+            # Each slice is fetched concurrently; failures are isolated per topic
+            slices = await asyncio.gather(
+                # 1. Device detail
+                self._safe_fetch_device_slice(f"devices.{device_id}.detail",
+                                              db.get_device_detail, device_id, experiment_id, time_window),
+                # 2. Port analysis
+                self._safe_fetch_device_slice(f"devices.{device_id}.port-analysis",
+                                              db.get_device_port_analysis, device_id, time_window, experiment_id),
+                # 3. Protocol distribution
+                self._safe_fetch_device_slice(f"devices.{device_id}.protocol-distribution",
+                                              db.get_device_protocol_distribution, device_id, time_window, experiment_id),
+                # 4. Traffic trend
+                self._safe_fetch_device_slice(f"devices.{device_id}.traffic-trend",
+                                              db.get_device_traffic_trend, device_id, time_window, experiment_id),
+                # 5. Network topology
+                self._safe_fetch_device_slice(f"devices.{device_id}.network-topology",
+                                              db.get_device_network_topology, device_id, time_window, experiment_id),
+                # 6. Activity timeline
+                self._safe_fetch_device_slice(f"devices.{device_id}.activity-timeline",
+                                              db.get_device_activity_timeline, device_id, time_window, experiment_id)
+            )
             
-            # 6. Activity timeline
-            activity_timeline = await self.database_service.get_device_activity_timeline(device_id, time_window, experiment_id)
-            if activity_timeline:
-                serializable_data = self._serialize_datetime_objects(activity_timeline)
-                await self.websocket_manager.broadcast_to_topic(
-                    f"devices.{device_id}.activity-timeline",
-                    serializable_data
-                )
+            # Publish all non-empty slices in a single pass over subscribers
+            updates = [update for update in slices if update]
+            if updates:
+                await self.websocket_manager.broadcast_many_raw(updates)
                 
         except Exception as e:
             logger.debug(f"Device analysis broadcast failed for device {device_id}: {e}")
     
-    def _serialize_datetime_objects(self, data):
-        """Recursive serialization of datetime objects"""
-        if isinstance(data, dict):
-            return {key: self._serialize_datetime_objects(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._serialize_datetime_objects(item) for item in data]
-        elif hasattr(data, 'isoformat'):  # datetime object
-            return data.isoformat()
-        else:
-            return data
+    async def _safe_fetch_device_slice(self, topic: str, fetcher: Callable, *args) -> Optional[tuple]:
+        """Fetch one device analysis slice as a (topic, payload JSON) pair, or None if empty"""
+        try:
+            data = await fetcher(*args)
+            if data:
+                return topic, encode_payload(data)
+        except Exception as e:
+            logger.debug(f"Device analysis fetch failed for {topic}: {e}")
+        return None
 
 
 class FileMonitorService:
@@ -629,8 +714,9 @@ class FileMonitorService:
         Args:
             config_path: External configuration file path (optional)
         """
-        # Load configuration
-        self.config = self._load_external_config(config_path)
+        # External configuration is loaded asynchronously in initialize()
+        self._config_path = config_path
+        self.config = {}
         
         # Service components
         self.observer = None
@@ -639,7 +725,6 @@ class FileMonitorService:
         self.pcap_engine = None
         self.queue_task = None
         self.is_running = False
-        self.event_loop = None
         
         # Configure logging for file monitor service
         self._setup_file_monitor_logging()
@@ -654,21 +739,49 @@ class FileMonitorService:
         self._broadcast_queue = asyncio.Queue(maxsize=100)  # Broadcast queue
         self._broadcast_worker_task = None
         
+        # Real-time broadcast coalescing per (experiment_id, device_id)
+        self._coalesce_seconds = get_config('file_monitor.websocket_broadcast.coalesce_window_ms', 
+                                            500, 'file_monitor.websocket_broadcast') / 1000
+        # Cap on how long a steady stream of triggers can hold back one broadcast
+        self._coalesce_max_seconds = get_config('file_monitor.websocket_broadcast.coalesce_max_wait_ms',
+                                                self._coalesce_seconds * 4000,
+                                                'file_monitor.websocket_broadcast') / 1000
+        # key -> (timer firing the broadcast, loop time of the first trigger it covers)
+        self._pending_broadcasts: Dict[Tuple[str, Optional[str]], Tuple[asyncio.TimerHandle, float]] = {}
+        # Weak values: a lock lives only while a broadcast holds or waits on it
+        self._broadcast_locks: "weakref.WeakValueDictionary[Tuple[str, Optional[str]], asyncio.Lock]" = \
+            weakref.WeakValueDictionary()
+        self._coalesced_tasks = set()
+        
         # Configuration-based monitoring directories
         project_root = Path(__file__).parent.parent.parent
         pcap_input_dir = get_config('file_monitor.directories.pcap_input_dir', 'pcap_input', 'file_monitor.directories')
         self.monitor_directories = [project_root / pcap_input_dir]
-        
-        # Configuration-based file handling settings
-        self.supported_extensions = set(
-            get_config('file_monitoring.supported_extensions',
-                     ['.pcap', '.pcapng', '.cap'], 
-                     'file_monitor.file_handling')
+        # (directory, resolved path string) pairs, resolved once for scans and path matching
+        self._resolved_monitor_dirs = [(d, str(d.resolve())) for d in self.monitor_directories]
+        self._monitor_dir_strs = [str(d) for d in self.monitor_directories]
+        self._monitor_dir_prefix = os.path.join(self._resolved_monitor_dirs[0][1], '')
+        
+        # Configuration-based file handling settings (lowercase, matched against lowered suffixes)
+        self.supported_extensions = frozenset(
+            ext.lower() for ext in get_config('file_monitoring.supported_extensions',
+                                              ['.pcap', '.pcapng', '.cap'], 
+                                              'file_monitor.file_handling')
         )
         
         # Configuration-based processing queue and statistics
         self.processing_queue = asyncio.Queue()
-        self.processed_files = set()
+        self.processed_files = OrderedDict()
+        self._batch_cap = max(1, get_config('file_monitor.processing.batch_size', 
+                                            10, 'file_monitor.processing'))
+        self._max_parallel_files = max(1, get_config('file_monitor.processing.max_concurrent_files', 
+                                                     3, 'file_monitor.processing'))
+        
+        # Startup scan database checks: pairs per query and queries in flight
+        self._db_check_batch_size = max(1, get_config('file_monitor.scanning.db_check_batch_size', 
+                                                      1000, 'file_monitor.scanning'))
+        self._db_check_sem = asyncio.BoundedSemaphore(
+            max(1, get_config('file_monitor.scanning.db_check_concurrency', 4, 'file_monitor.scanning')))
         
         # WebSocket broadcast statistics
         self.websocket_stats = {
@@ -690,19 +803,27 @@ class FileMonitorService:
         self.timezone = timezone.utc
         timezone_str = get_config('file_monitor.timezone', 'UTC', 'file_monitor')
         if timezone_str.lower() == 'local':
-            try:
-                import tzlocal
-                self.timezone = tzlocal.get_localzone()
-            except ImportError:
-                logger.warning("tzlocal not available, using UTC")
-                self.timezone = timezone.utc
+            self.timezone = _LOCAL_TZ
         
         # Display configuration summary
-        directory_list = [str(d) for d in self.monitor_directories]
-        
         logger.info(get_log_message('file_monitor', 'service_initialized', 
                                    component='file_monitor.service',
-                                   directories=directory_list))
+                                   directories=self._monitor_dir_strs))
+        
+        # Snapshot hot-path configuration flags
+        self._snapshot_runtime_config()
+        
+        # Pre-bound log message builders for per-file and per-broadcast log sites
+        self._msg_ws_ok = functools.partial(get_log_message, 'file_monitor', 'websocket_broadcast_success',
+                                            component='file_monitor.websocket')
+        self._msg_ws_fail = functools.partial(get_log_message, 'file_monitor', 'websocket_broadcast_failed',
+                                              component='file_monitor.websocket')
+        self._msg_file_ok = functools.partial(get_log_message, 'file_monitor', 'file_processing_info',
+                                              component='file_monitor.processor')
+        self._msg_file_fail = functools.partial(get_log_message, 'file_monitor', 'file_processing_failed',
+                                                component='file_monitor.processor')
+        self._msg_file_skip = functools.partial(get_log_message, 'file_monitor', 'file_delete_skipped',
+                                                component='file_monitor.deletion')
     
     def _setup_file_monitor_logging(self):
         """Setup file monitor specific logging"""
@@ -725,15 +846,20 @@ class FileMonitorService:
         file_monitor_logger.propagate = False
         
         # Remove existing handlers to avoid duplicates
+        _stop_log_listener()
         for handler in file_monitor_logger.handlers[:]:
             file_monitor_logger.removeHandler(handler)
         
-        # Add file handler
+        # Add file handler behind a queue so emitting a record never blocks the event loop
+        global _log_listener
         file_handler = logging.FileHandler(log_file_path, mode='a', encoding='utf-8')
         file_handler.setLevel(log_level)
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(formatter)
-        file_monitor_logger.addHandler(file_handler)
+        log_queue = queue.SimpleQueue()
+        file_monitor_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _log_listener.start()
         
         # Store log file path for cleanup
         self.log_file_path = log_file_path
@@ -749,25 +875,19 @@ class FileMonitorService:
         """Setup scheduler configuration"""
         # Get scan schedule configuration
         # Try both config keys for compatibility
-        self.schedule_enabled = get_config('file_monitoring.schedule.enabled', 
-                                         get_config('file_monitor.schedule.enabled', True, 'file_monitor.schedule'), 
-                                         'file_monitoring.schedule')
-        self.scan_times = get_config('file_monitoring.schedule.scan_times', 
-                                   get_config('file_monitor.schedule.scan_times', 
-                                            ['06:00', '12:00', '18:00', '23:59'], 
-                                            'file_monitor.schedule'),
-                                   'file_monitoring.schedule')
-        self.timezone_str = get_config('file_monitoring.schedule.timezone', 
-                                     get_config('file_monitor.schedule.timezone', 'local', 'file_monitor.schedule'),
-                                     'file_monitoring.schedule')
+        self.schedule_enabled = _get_config_with_fallback('file_monitoring.schedule.enabled', 'file_monitoring.schedule',
+                                                          'file_monitor.schedule.enabled', 'file_monitor.schedule',
+                                                          True)
+        self.scan_times = _get_config_with_fallback('file_monitoring.schedule.scan_times', 'file_monitoring.schedule',
+                                                    'file_monitor.schedule.scan_times', 'file_monitor.schedule',
+                                                    ['06:00', '12:00', '18:00', '23:59'])
+        self.timezone_str = _get_config_with_fallback('file_monitoring.schedule.timezone', 'file_monitoring.schedule',
+                                                      'file_monitor.schedule.timezone', 'file_monitor.schedule',
+                                                      'local')
         
         # Setup timezone for scheduler
-        import pytz
         if self.timezone_str == 'local':
-            import tzlocal
-            local_tz = tzlocal.get_localzone()
-            # Convert to pytz timezone for consistent API
-            self.timezone = pytz.timezone(str(local_tz))
+            self.timezone = _LOCAL_PYTZ
         else:
             self.timezone = pytz.timezone(self.timezone_str)
         
@@ -775,14 +895,68 @@ class FileMonitorService:
         if get_config('file_monitor.performance.enable_deletion_stats', True, 'file_monitor.performance'):
             self.deletion_stats = {'files_deleted': 0, 'files_backed_up': 0}
     
-    def _load_external_config(self, config_path: Optional[str]) -> Dict:
-        """Load external configuration file"""
+    def _snapshot_runtime_config(self):
+        """Snapshot configuration flags read on every processed file and broadcast"""
+        self._cfg = SimpleNamespace(
+            info_enabled=logger.isEnabledFor(logging.INFO),
+            log_file_processing=get_config('file_monitor.logging.log_file_processing', 
+                                           True, 'file_monitor.logging'),
+            log_ws_broadcasts=get_config('file_monitor.logging.log_websocket_broadcasts', 
+                                         True, 'file_monitor.logging'),
+            auto_delete=get_config('file_monitoring.auto_delete_after_processing', 
+                                   False, 'file_monitor.file_handling'),
+            keep_failed=get_config('file_monitoring.keep_failed_files', 
+                                   True, 'file_monitor.file_handling'),
+            delete_delay=get_config('file_monitoring.delete_delay_seconds', 
+                                    5, 'file_monitor.file_handling'),
+            realtime_updates=get_config('file_monitor.websocket_broadcast.enable_realtime_updates', 
+                                        True, 'file_monitor.websocket_broadcast'),
+            analysis_time_windows=get_config('file_monitor.websocket_broadcast.analysis_time_windows', 
+                                             {}, 'file_monitor.websocket_broadcast'),
+            extract_from_path=get_config('file_monitoring.extract_experiment_from_path', 
+                                         True, 'file_monitoring'),
+            extract_mac=get_config('file_monitoring.extract_mac_from_filename', 
+                                   True, 'file_monitoring'),
+            default_prefix=get_config('file_monitoring.default_experiment_prefix', 
+                                      'auto_', 'file_monitoring'),
+            recursive_scan=get_config('file_monitor.scanning.recursive_scan', 
+                                      True, 'file_monitor.scanning'),
+            ignore_hidden=get_config('file_monitor.scanning.ignore_hidden_files', 
+                                     True, 'file_monitor.scanning'),
+            ignore_temp=get_config('file_monitor.scanning.ignore_temp_files', 
+                                   True, 'file_monitor.scanning'),
+            log_file_detection=get_config('file_monitor.logging.log_file_detection', 
+                                          True, 'file_monitor.logging'),
+            log_error_details=get_config('file_monitor.logging.log_error_details', 
+                                         True, 'file_monitor.logging')
+        )
+        self._cfg.scan_name_re = _build_scan_name_re(self.supported_extensions,
+                                                     self._cfg.ignore_hidden, self._cfg.ignore_temp)
+        # Default experiment ID is rebuilt lazily (prefix may have changed)
+        self._default_experiment_day = None
+        self._default_experiment_id_str = None
+    
+    def _default_experiment_id(self) -> str:
+        """Default experiment ID for today, formatted only when the date changes"""
+        today = date.today()
+        if today != self._default_experiment_day:
+            self._default_experiment_id_str = f"{self._cfg.default_prefix}{today.strftime('%Y%m%d')}"
+            self._default_experiment_day = today
+        return self._default_experiment_id_str
+    
+    def reload_config(self):
+        """Refresh the cached runtime configuration (e.g. after user config changes)"""
+        self._snapshot_runtime_config()
+        logger.info("File monitor runtime configuration reloaded")
+    
+    async def _load_external_config(self, config_path: Optional[str]) -> Dict:
+        """Load external configuration file without blocking the event loop"""
         external_config = {}
         
-        if config_path and Path(config_path).exists():
+        if config_path and await asyncio.to_thread(Path(config_path).exists):
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    external_config = json.load(f)
+                async with aiofiles.open(config_path, 'r', encoding='utf-8') as f:
+                    external_config = json.loads(await f.read())
                 logger.debug(f"Loaded external config from {config_path}")
             except Exception as e:
                 logger.warning(get_log_message('file_monitor', 'config_load_failed', 
@@ -798,6 +972,9 @@ class FileMonitorService:
             logger.info(get_log_message('file_monitor', 'service_initializing', 
                                        component='file_monitor.service'))
             
+            # Load external configuration
+            self.config = await self._load_external_config(self._config_path)
+            
             # Initialize database connection
             self.db_manager = PostgreSQLDatabaseManager()
             if not await self.db_manager.initialize():
@@ -817,9 +994,6 @@ class FileMonitorService:
             # Replace ScheduledPCAPScanner's queue with FileMonitorService's queue
             self.file_handler.processing_queue = self.processing_queue
             
-            # Set event loop reference
-            self.event_loop = asyncio.get_event_loop()
-            
             # Start processing queue
             self.queue_task = asyncio.create_task(self._process_queue())
             
@@ -828,7 +1002,7 @@ class FileMonitorService:
             
             logger.info(get_log_message('file_monitor', 'service_initialized', 
                                        component='file_monitor.service',
-                                       directories=[str(d) for d in self.monitor_directories]))
+                                       directories=self._monitor_dir_strs))
             return True
             
         except Exception as e:
@@ -862,12 +1036,10 @@ class FileMonitorService:
             if result and result.get('success'):
                 packets_processed = result.get('packets_processed', 0)
                 
-                if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                    logger.info(get_log_message('file_monitor', 'file_processing_info', 
-                                              component='file_monitor.processor',
-                                              experiment_id=experiment_info['experiment_id'],
-                                              device_mac=experiment_info['device_mac'],
-                                              packets=packets_processed))
+                if self._cfg.info_enabled and self._cfg.log_file_processing:
+                    logger.info(self._msg_file_ok(experiment_id=experiment_info['experiment_id'],
+                                                  device_mac=experiment_info['device_mac'],
+                                                  packets=packets_processed))
                 
                 # File deletion processing
                 # Consider file successfully processed even if packets_processed == 0 (duplicates)
@@ -882,37 +1054,22 @@ class FileMonitorService:
             else:
                 error_msg = result.get('error', 'Unknown error') if result else 'Processing returned empty result'
                 
-                if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                    logger.error(get_log_message('file_monitor', 'file_processing_failed', 
-                                               component='file_monitor.processor',
-                                               file_path=str(file_path), error=error_msg))
+                if self._cfg.log_file_processing and logger.isEnabledFor(logging.ERROR):
+                    logger.error(self._msg_file_fail(file_path=str(file_path), error=error_msg))
                 
                 await self._handle_processed_file_deletion(file_path, False)
                 return False
                 
         except Exception as e:
-            if get_config('file_monitor.logging.log_file_processing', True, 'file_monitor.logging'):
-                logger.error(get_log_message('file_monitor', 'file_processing_failed', 
-                                           component='file_monitor.processor',
-                                           file_path=str(file_path), error=str(e)))
+            if self._cfg.log_file_processing and logger.isEnabledFor(logging.ERROR):
+                logger.error(self._msg_file_fail(file_path=str(file_path), error=str(e)))
             
             await self._handle_processed_file_deletion(file_path, False)
             return False
     
     def _extract_device_id_from_result(self, result: Dict, experiment_info: Dict) -> Optional[str]:
-        """Extract device ID from processing result"""
-        device_id = None
-        
-        # Get device ID from storage_result
-        if result.get('storage_result') and isinstance(result['storage_result'], dict):
-            device_id = result['storage_result'].get('device_id')
-        
-        # If device ID is not found, try to find it by MAC address
-        if not device_id and experiment_info.get('device_mac'):
-            # Here you can add logic to find device ID by MAC address
-            pass
-        
-        return device_id
+        """Extract device ID from processing result (storage_result is a dict or None)"""
+        return (result.get('storage_result') or {}).get('device_id')
     
     async def _handle_processed_file_deletion(self, file_path: Path, success: bool):
         """
@@ -924,40 +1081,35 @@ class FileMonitorService:
         """
         try:
             # Check if automatic deletion is enabled
-            auto_delete = get_config('file_monitoring.auto_delete_after_processing', 
-                                   False, 'file_monitor.file_handling')
-            if not auto_delete:
+            if not self._cfg.auto_delete:
                 return
             
             # If processing fails and configuration preserves failed files, do not delete
-            keep_failed = get_config('file_monitoring.keep_failed_files', 
-                                   True, 'file_monitor.file_handling')
-            if not success and keep_failed:
-                logger.info(get_log_message('file_monitor', 'file_kept_failed', 
-                                          component='file_monitor.deletion',
-                                          file_path=str(file_path)))
+            if not success and self._cfg.keep_failed:
+                if self._cfg.info_enabled:
+                    logger.info(get_log_message('file_monitor', 'file_kept_failed', 
+                                              component='file_monitor.deletion',
+                                              file_path=str(file_path)))
                 return
             
             # Deletion delay
-            delete_delay = get_config('file_monitoring.delete_delay_seconds', 
-                                    5, 'file_monitor.file_handling')
+            delete_delay = self._cfg.delete_delay
             if delete_delay > 0:
                 await asyncio.sleep(delete_delay)
             
-            # Check if file still exists
-            if not file_path.exists():
-                logger.info(get_log_message('file_monitor', 'file_delete_skipped', 
-                                          component='file_monitor.deletion',
-                                          file_path=str(file_path)))
-                return
-            
             # Backup functionality has been removed
             
-            # Delete file
-            file_path.unlink()
-            logger.info(get_log_message('file_monitor', 'file_deleted', 
-                                      component='file_monitor.deletion',
-                                      file_path=str(file_path)))
+            # Delete file; a missing file means there is nothing left to do
+            try:
+                await asyncio.to_thread(os.unlink, str(file_path))
+            except FileNotFoundError:
+                if self._cfg.info_enabled:
+                    logger.info(self._msg_file_skip(file_path=str(file_path)))
+                return
+            if self._cfg.info_enabled:
+                logger.info(get_log_message('file_monitor', 'file_deleted', 
+                                          component='file_monitor.deletion',
+                                          file_path=str(file_path)))
             
             # Update deletion statistics
             if hasattr(self, 'deletion_stats'):
@@ -972,31 +1124,63 @@ class FileMonitorService:
         """
         Enhanced real-time updates with protection layer
         
+        Triggers for the same experiment/device arriving within the coalescing
+        window are merged into a single broadcast, sent no later than the max
+        wait after the first of them.
+        
         Args:
             experiment_id: Experiment ID
             device_id: Device ID (optional)
         """
         # Check if real-time updates are enabled
-        if not get_config('file_monitor.websocket_broadcast.enable_realtime_updates', 
-                         True, 'file_monitor.websocket_broadcast'):
+        if not self._cfg.realtime_updates:
             return
         
-        try:
-            # Use protection layer for safe broadcast
-            await self._websocket_protection.safe_broadcast(
-                experiment_id=experiment_id,
-                device_id=device_id,
-                semaphore=self._concurrent_broadcast_semaphore,
-                last_broadcast_time=self._last_broadcast_time
-            )
-            
-        except Exception as e:
-            # WebSocket errors should not affect file processing
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed_gracefully', 
-                                             component='file_monitor.websocket',
-                                             experiment_id=experiment_id, error=str(e)))
-            # Continue execution, do not throw exception
+        key = (experiment_id, device_id)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        
+        # Restart the window for this key, but never past the max wait since its first trigger
+        first_trigger = now
+        pending = self._pending_broadcasts.pop(key, None)
+        if pending:
+            handle, first_trigger = pending
+            handle.cancel()
+        delay = min(self._coalesce_seconds, first_trigger + self._coalesce_max_seconds - now)
+        
+        self._pending_broadcasts[key] = (
+            loop.call_later(max(0.0, delay), self._start_coalesced_broadcast, key),
+            first_trigger
+        )
+    
+    def _start_coalesced_broadcast(self, key: Tuple[str, Optional[str]]):
+        """Launch the broadcast for a key whose coalescing window has elapsed"""
+        self._pending_broadcasts.pop(key, None)
+        task = asyncio.create_task(self._do_broadcast(*key))
+        self._coalesced_tasks.add(task)
+        task.add_done_callback(self._coalesced_tasks.discard)
+    
+    async def _do_broadcast(self, experiment_id: str, device_id: Optional[str]):
+        """Run the protected broadcast, deferring behind any in-flight broadcast for the same key"""
+        lock = self._broadcast_locks.setdefault((experiment_id, device_id), asyncio.Lock())
+        
+        async with lock:
+            try:
+                # Use protection layer for safe broadcast
+                await self._websocket_protection.safe_broadcast(
+                    experiment_id=experiment_id,
+                    device_id=device_id,
+                    semaphore=self._concurrent_broadcast_semaphore,
+                    last_broadcast_time=self._last_broadcast_time
+                )
+                
+            except Exception as e:
+                # WebSocket errors should not affect file processing
+                if self._cfg.log_ws_broadcasts:
+                    logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed_gracefully', 
+                                                 component='file_monitor.websocket',
+                                                 experiment_id=experiment_id, error=str(e)))
+                # Continue execution, do not throw exception
     
     def _get_database_service(self):
         """Get database service instance"""
@@ -1018,7 +1202,7 @@ class FileMonitorService:
             try:
                 from database.services.database_service import DatabaseService
                 database_service = DatabaseService(self.db_manager)
-                if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
+                if self._cfg.log_ws_broadcasts:
                     logger.info(get_log_message('file_monitor', 'database_service_created', 
                                               component='file_monitor.websocket'))
             except Exception as e:
@@ -1037,15 +1221,11 @@ class FileMonitorService:
                 experiment_data
             )
         
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"experiments.{experiment_id}"))
+            if self._cfg.info_enabled and self._cfg.log_ws_broadcasts:
+                logger.info(self._msg_ws_ok(topic=f"experiments.{experiment_id}"))
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"experiments.{experiment_id}", error=str(e)))
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                logger.warning(self._msg_ws_fail(topic=f"experiments.{experiment_id}", error=str(e)))
             
     async def _broadcast_experiments_overview(self, websocket_manager, database_service):
         """Broadcast experiment overview update"""
@@ -1056,15 +1236,11 @@ class FileMonitorService:
                 experiments_data
             )
         
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic="experiments.overview"))
+            if self._cfg.info_enabled and self._cfg.log_ws_broadcasts:
+                logger.info(self._msg_ws_ok(topic="experiments.overview"))
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic="experiments.overview", error=str(e)))
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                logger.warning(self._msg_ws_fail(topic="experiments.overview", error=str(e)))
             
     async def _broadcast_devices_overview(self, websocket_manager, database_service):
         """Broadcast device overview update"""
@@ -1075,15 +1251,11 @@ class FileMonitorService:
                 devices_data
             )
         
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic="devices.overview"))
+            if self._cfg.info_enabled and self._cfg.log_ws_broadcasts:
+                logger.info(self._msg_ws_ok(topic="devices.overview"))
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic="devices.overview", error=str(e)))
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                logger.warning(self._msg_ws_fail(topic="devices.overview", error=str(e)))
             
     async def _broadcast_device_detail(self, websocket_manager, database_service, device_id, experiment_id):
         """Broadcast device detail update"""
@@ -1091,128 +1263,71 @@ class FileMonitorService:
             device_detail_data = await database_service.get_device_detail(device_id, experiment_id)
             
             if device_detail_data:
-                # Serialize datetime objects
-                serializable_data = self._serialize_datetime_objects(device_detail_data)
-                
-                await websocket_manager.broadcast_to_topic(
+                # Encode once, datetime objects as ISO strings
+                await websocket_manager.broadcast_to_topic_raw(
                     f"devices.{device_id}.detail",
-                    serializable_data
+                    encode_payload(device_detail_data)
                 )
             
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.detail"))
+            if self._cfg.info_enabled and self._cfg.log_ws_broadcasts:
+                logger.info(self._msg_ws_ok(topic=f"devices.{device_id}.detail"))
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.detail", error=str(e)))
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                logger.warning(self._msg_ws_fail(topic=f"devices.{device_id}.detail", error=str(e)))
     
     async def _broadcast_device_analysis(self, websocket_manager, database_service, device_id, experiment_id):
         """Broadcast device analysis update"""
-        time_windows = get_config('file_monitor.websocket_broadcast.analysis_time_windows', 
-                                {}, 'file_monitor.websocket_broadcast')
-        
-        # Port analysis
-        try:
-            port_time_window = time_windows.get('port_analysis', '24h')
-            port_analysis_data = await database_service.get_device_port_analysis(device_id, port_time_window, experiment_id)
-            serializable_port_data = self._serialize_datetime_objects(port_analysis_data)
-            await websocket_manager.broadcast_to_topic(
-                f"devices.{device_id}.port-analysis",
-                serializable_port_data
-            )
-        
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.port-analysis"))
-        except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.port-analysis", error=str(e)))
-                        
-        # Protocol distribution
-        try:
-            protocol_time_window = time_windows.get('protocol_distribution', '1h')
-            protocol_data = await database_service.get_device_protocol_distribution(device_id, protocol_time_window, experiment_id)
-            serializable_protocol_data = self._serialize_datetime_objects(protocol_data)
-            await websocket_manager.broadcast_to_topic(
-                f"devices.{device_id}.protocol-distribution",
-                serializable_protocol_data
-            )
+        time_windows = self._cfg.analysis_time_windows
+        
+        # Fetch all analysis slices concurrently
+        slices = await asyncio.gather(
+            # Port analysis
+            self._fetch_analysis_slice(f"devices.{device_id}.port-analysis",
+                                       database_service.get_device_port_analysis, device_id,
+                                       time_windows.get('port_analysis', '24h'), experiment_id),
+            # Protocol distribution
+            self._fetch_analysis_slice(f"devices.{device_id}.protocol-distribution",
+                                       database_service.get_device_protocol_distribution, device_id,
+                                       time_windows.get('protocol_distribution', '1h'), experiment_id),
+            # Network topology
+            self._fetch_analysis_slice(f"devices.{device_id}.network-topology",
+                                       database_service.get_device_network_topology, device_id,
+                                       time_windows.get('network_topology', '24h'), experiment_id),
+            # Activity timeline
+            self._fetch_analysis_slice(f"devices.{device_id}.activity-timeline",
+                                       database_service.get_device_activity_timeline, device_id,
+                                       time_windows.get('activity_timeline', '24h'), experiment_id),
+            # Traffic trend
+            self._fetch_analysis_slice(f"devices.{device_id}.traffic-trend",
+                                       database_service.get_device_traffic_trend, device_id,
+                                       time_windows.get('traffic_trend', '24h'), experiment_id)
+        )
         
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.protocol-distribution"))
-        except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.protocol-distribution", error=str(e)))
-                        
-        # Network topology
-        try:
-            topology_time_window = time_windows.get('network_topology', '24h')
-            topology_data = await database_service.get_device_network_topology(device_id, topology_time_window, experiment_id)
-            serializable_topology_data = self._serialize_datetime_objects(topology_data)
-            await websocket_manager.broadcast_to_topic(
-                f"devices.{device_id}.network-topology",
-                serializable_topology_data
-            )
+        updates = [update for update in slices if update]
+        if not updates:
+            return
         
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.network-topology"))
-        except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.network-topology", error=str(e)))
-                        
-        # Activity timeline
+        # Publish every slice in a single pass over subscribers
         try:
-            timeline_time_window = time_windows.get('activity_timeline', '24h')
-            timeline_data = await database_service.get_device_activity_timeline(device_id, timeline_time_window, experiment_id)
-            serializable_timeline_data = self._serialize_datetime_objects(timeline_data)
-            await websocket_manager.broadcast_to_topic(
-                f"devices.{device_id}.activity-timeline",
-                serializable_timeline_data
-            )
-        
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.activity-timeline"))
+            await websocket_manager.broadcast_many_raw(updates)
+            
+            if self._cfg.info_enabled and self._cfg.log_ws_broadcasts:
+                for topic, _ in updates:
+                    logger.info(self._msg_ws_ok(topic=topic))
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.activity-timeline", error=str(e)))
-                        
-        # Traffic trend
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                for topic, _ in updates:
+                    logger.warning(self._msg_ws_fail(topic=topic, error=str(e)))
+    
+    async def _fetch_analysis_slice(self, topic: str, fetcher: Callable, *args) -> Optional[tuple]:
+        """Fetch one analysis slice as a (topic, payload JSON) pair, isolating failures per topic"""
         try:
-            traffic_time_window = time_windows.get('traffic_trend', '24h')
-            traffic_data = await database_service.get_device_traffic_trend(device_id, traffic_time_window, experiment_id)
-            serializable_traffic_data = self._serialize_datetime_objects(traffic_data)
-            await websocket_manager.broadcast_to_topic(
-                f"devices.{device_id}.traffic-trend",
-                serializable_traffic_data
-            )
-        
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.info(get_log_message('file_monitor', 'websocket_broadcast_success', 
-                                          component='file_monitor.websocket',
-                                          topic=f"devices.{device_id}.traffic-trend"))
+            data = await fetcher(*args)
+            return topic, encode_payload(data)
         except Exception as e:
-            if get_config('file_monitor.logging.log_websocket_broadcasts', True, 'file_monitor.logging'):
-                logger.warning(get_log_message('file_monitor', 'websocket_broadcast_failed', 
-                                             component='file_monitor.websocket',
-                                             topic=f"devices.{device_id}.traffic-trend", error=str(e)))
+            if self._cfg.log_ws_broadcasts and logger.isEnabledFor(logging.WARNING):
+                logger.warning(self._msg_ws_fail(topic=topic, error=str(e)))
+            return None
     
 
     
@@ -1229,17 +1344,20 @@ class FileMonitorService:
         try:
 
             # Experiment information extraction
-            extract_from_path = get_config('file_monitoring.extract_experiment_from_path', 
-                                         True, 'file_monitoring')
-            
-            if extract_from_path:
-                # Use actual monitoring directory and ensure it's an absolute path
-                monitor_dir = self.monitor_directories[0].resolve()
-                file_path = file_path.resolve()
- 
-                try:
-                    relative_path = file_path.relative_to(monitor_dir)
-                    path_parts = relative_path.parts
+            if self._cfg.extract_from_path:
+                # Use actual monitoring directory (resolved once at init), matched by string prefix
+                monitor_prefix = self._monitor_dir_prefix
+                if not file_path.is_absolute():
+                    file_path = file_path.resolve()
+                path_str = str(file_path)
+                
+                if not path_str.startswith(monitor_prefix):
+                    # Path may go through a symlink; resolve only in this case
+                    file_path = file_path.resolve()
+                    path_str = str(file_path)
+                
+                if path_str.startswith(monitor_prefix):
+                    path_parts = path_str[len(monitor_prefix):].split(os.sep)
                
                     if len(path_parts) >= 2:
                         # Format: pcap_input/experiment_name/file.pcap
@@ -1247,30 +1365,22 @@ class FileMonitorService:
                         # logger.info(f"[DEBUG] Using first path part as experiment ID: {experiment_id}")
                     else:
                         # Format: pcap_input/file.pcap - using configuration-based default prefix
-                        default_prefix = get_config('file_monitoring.default_experiment_prefix', 
-                                                  'auto_', 'file_monitoring')
-                        experiment_id = f"{default_prefix}{datetime.now().strftime('%Y%m%d')}"
+                        experiment_id = self._default_experiment_id()
                         # logger.warning(f"[DEBUG] Path parts less than 2, using default experiment ID: {experiment_id}")
                     
-                except ValueError as ve:
+                else:
                     # Path not in monitoring directory, using default experiment ID
-                    # logger.error(f"[ERROR] File path not in monitoring directory: {ve}")
-                    default_prefix = get_config('file_monitoring.default_experiment_prefix', 
-                                              'auto_', 'file_monitoring')
-                    experiment_id = f"{default_prefix}{datetime.now().strftime('%Y%m%d')}"
+                    experiment_id = self._default_experiment_id()
                     # logger.warning(f"[ERROR] Using default experiment ID: {experiment_id}")
             else:
                 # Not from path extraction, using default experiment ID
-                default_prefix = get_config('file_monitoring.default_experiment_prefix', 
-                                          'auto_', 'file_monitoring')
-                experiment_id = f"{default_prefix}{datetime.now().strftime('%Y%m%d')}"
+                experiment_id = self._default_experiment_id()
                 # logger.info(f"[DEBUG] Configuration disabled path extraction, using default experiment ID: {experiment_id}")
             
             # MAC address extraction
-            extract_mac = get_config('file_monitoring.extract_mac_from_filename', 
-                                   True, 'file_monitoring')
-            if extract_mac:
-                device_mac = self._extract_mac_from_filename(file_path.name)
+            file_name = file_path.name
+            if self._cfg.extract_mac:
+                device_mac = self._extract_mac_from_filename(file_name)
             else:
                 device_mac = "00:00:00:00:00:00"  # Default MAC address
             
@@ -1279,7 +1389,7 @@ class FileMonitorService:
             return {
                 'experiment_id': experiment_id,
                 'device_mac': device_mac,
-                'file_name': file_path.name
+                'file_name': file_name
             }
             
         except Exception as e:
@@ -1287,49 +1397,30 @@ class FileMonitorService:
             # logger.error(f"[CRITICAL] Unexpected error in experiment information extraction: {e}")
             # logger.error(f"[CRITICAL] File path: {file_path}")
             
-            default_prefix = get_config('file_monitoring.default_experiment_prefix', 
-                                      'auto_', 'file_monitoring')
-            experiment_id = f"{default_prefix}{datetime.now().strftime('%Y%m%d')}"
-            device_mac = self._extract_mac_from_filename(file_path.name)
+            file_name = file_path.name
+            experiment_id = self._default_experiment_id()
+            device_mac = self._extract_mac_from_filename(file_name)
             
             return {
                 'experiment_id': experiment_id,
                 'device_mac': device_mac,
-                'file_name': file_path.name
+                'file_name': file_name
             }
     
     def _extract_mac_from_filename(self, filename: str) -> str:
         """Extract MAC address from filename"""
-        import re
-        
-        # Common MAC address formats
-        mac_patterns = [
-            r'([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})',  # Standard format
-            r'([0-9A-Fa-f]{2}){6}',  # No separator format
-        ]
-        
-        for pattern in mac_patterns:
-            match = re.search(pattern, filename)
-            if match:
-                mac = match.group(0)
-                # Standardize to colon-separated format
-                if ':' not in mac and '-' not in mac:
-                    mac = ':'.join([mac[i:i+2] for i in range(0, 12, 2)])
-                return mac.upper()
-        
-        # If MAC address cannot be extracted, generate a default value
-        return "00:00:00:00:00:00"
-    
-    def _serialize_datetime_objects(self, data):
-        """Recursively serialize datetime objects in data structure to ISO string"""
-        if isinstance(data, dict):
-            return {key: self._serialize_datetime_objects(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._serialize_datetime_objects(item) for item in data]
-        elif hasattr(data, 'isoformat'):  # datetime object
-            return data.isoformat()
-        else:
-            return data
+        # Names shorter than a bare 12-digit MAC cannot contain one
+        match = _MAC_RE.search(filename) if len(filename) >= 12 else None
+        if match is None:
+            # If MAC address cannot be extracted, generate a default value
+            return "00:00:00:00:00:00"
+        
+        mac = match.group(1)
+        if mac is None:
+            # Standardize the no-separator format to colon-separated
+            mac = match.group(2)
+            mac = f"{mac[0:2]}:{mac[2:4]}:{mac[4:6]}:{mac[6:8]}:{mac[8:10]}:{mac[10:12]}"
+        return mac.upper()
     
     async def start_monitoring(self, block=True):
         """Monitoring start"""
@@ -1348,9 +1439,6 @@ class FileMonitorService:
             # Configuration-based monitoring directory setting
             # No longer scheduling scans, so this is no longer relevant for the main service
             
-            # Set event loop reference
-            self.event_loop = asyncio.get_event_loop()
-            
             # Start processing queue
             self.queue_task = asyncio.create_task(self._process_queue())
             
@@ -1363,7 +1451,7 @@ class FileMonitorService:
             
             # Log scheduled scanning configuration
             logger.info(f"Scheduled scanning enabled with times: {self.file_handler.scan_times}")
-            logger.info(f"Monitoring directories: {[str(d) for d in self.monitor_directories]}")
+            logger.info(f"Monitoring directories: {self._monitor_dir_strs}")
             
             # Determine if blocking based on parameter
             if block:
@@ -1402,60 +1490,53 @@ class FileMonitorService:
             already_processed = 0
             
             # Scanning settings
-            recursive_scan = get_config('file_monitor.scanning.recursive_scan', 
-                                      True, 'file_monitor.scanning')
-            ignore_hidden = get_config('file_monitor.scanning.ignore_hidden_files', 
-                                     True, 'file_monitor.scanning')
-            ignore_temp = get_config('file_monitor.scanning.ignore_temp_files', 
-                                   True, 'file_monitor.scanning')
-            
-            for monitor_dir in self.monitor_directories:
+            recursive_scan = self._cfg.recursive_scan
+            ignore_hidden = self._cfg.ignore_hidden
+            scan_name_match = self._cfg.scan_name_re.match
+            candidates: Dict[str, Path] = {}
+            
+            for monitor_dir, resolved_dir in self._resolved_monitor_dirs:
                 logger.info(get_log_message('file_monitor', 'scanning_directory', 
                                           component='file_monitor.scanner',
-                                          directory=str(monitor_dir.resolve())))
+                                          directory=resolved_dir))
                 
                 if not monitor_dir.exists():
                     logger.warning(get_log_message('file_monitor', 'directory_not_exists', 
                                                  component='file_monitor.scanner',
-                                                 directory=str(monitor_dir.resolve())))
+                                                 directory=resolved_dir))
                     continue
                 
-                # File search
-                file_iterator = monitor_dir.rglob("*") if recursive_scan else monitor_dir.glob("*")
-                
-                for file_path in file_iterator:
-                    if not file_path.is_file():
-                        continue
-                    
-                    # Check file extension
-                    if file_path.suffix.lower() not in self.file_handler.supported_extensions:
-                        continue
-                    
-                    # File filtering
-                    if ignore_hidden and file_path.name.startswith('.'):
-                        continue
-                    
-                    if ignore_temp and (file_path.name.endswith('.tmp') or file_path.name.endswith('.temp')):
-                        continue
-                    
-                    total_files += 1
-                    
-                    # Check if file is processed in database
-                    is_processed = await self._check_file_processed_in_database(file_path)
-                    
-                    if is_processed:
-                        already_processed += 1
+                # File search and filtering (extension, hidden and temp files) in a worker thread
+                found = await asyncio.to_thread(_walk_and_filter, str(monitor_dir), scan_name_match,
+                                                recursive_scan, ignore_hidden)
+                total_files += len(found)
+                for path_str in found:
+                    candidates[path_str] = Path(path_str)
+            
+            # Check which files are processed in database with one query
+            processed = await self._check_files_processed_in_database(candidates)
+            
+            # Per-file log levels checked once per scan, one detection time for the batch
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            info_enabled = logger.isEnabledFor(logging.INFO)
+            detected_time = datetime.now(timezone.utc)
+            
+            for path_str, file_path in candidates.items():
+                if path_str in processed:
+                    already_processed += 1
+                    if debug_enabled:
                         logger.debug(get_log_message('file_monitor', 'file_already_processed', 
                                                    component='file_monitor.scanner',
-                                                   file_path=str(file_path)))
-                        # Add to memory cache to avoid duplicate processing
-                        self.file_handler.processed_files.add(str(file_path))
-                    else:
-                        new_files += 1
+                                                   file_path=path_str))
+                    # Add to memory cache to avoid duplicate processing
+                    self.file_handler._mark_processed(path_str)
+                else:
+                    new_files += 1
+                    if info_enabled:
                         logger.info(get_log_message('file_monitor', 'file_unprocessed', 
                                                   component='file_monitor.scanner',
-                                                  file_path=str(file_path)))
-                        await self.file_handler._queue_file_for_processing(file_path)
+                                                  file_path=path_str))
+                    await self.file_handler._queue_file_for_processing(file_path, detected_time)
             
             logger.info(get_log_message('file_monitor', 'scanning_complete', 
                                        component='file_monitor.scanner',
@@ -1466,45 +1547,71 @@ class FileMonitorService:
                                        component='file_monitor.scanner',
                                        error=str(e)))
             import traceback
-            if get_config('file_monitor.logging.log_error_details', True, 'file_monitor.logging'):
+            if self._cfg.log_error_details:
                 logger.error(get_log_message('file_monitor', 'error_details', 
                                            component='file_monitor.scanner',
                                            details=traceback.format_exc()))
     
-    async def _check_file_processed_in_database(self, file_path: Path) -> bool:
-        """Check if file is processed in database"""
-        try:
-            # Extract experiment information from filename
+    async def _check_files_processed_in_database(self, file_paths: Dict[str, Path]) -> set:
+        """
+        Check which files are processed in database using a single query
+        
+        Args:
+            file_paths: Candidate files keyed by path string
+        
+        Returns:
+            Set of path strings whose (device MAC, experiment) pair already has packet_flows records
+        """
+        # Map each (MAC, experiment) pair to the files it covers
+        files_by_pair: Dict[Tuple[str, str], List[str]] = {}
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for path_str, file_path in file_paths.items():
             experiment_info = self._extract_experiment_info(file_path)
             experiment_id = experiment_info.get('experiment_id')
             device_mac = experiment_info.get('device_mac')
             
             if not experiment_id or not device_mac:
-                logger.debug(f"Cannot extract experiment information, regarded as unprocessed: {file_path}")
-                return False
-            
-            # Check if there are corresponding packet_flows records in the database
-            check_query = """
-            SELECT COUNT(*) as count 
+                if debug_enabled:
+                    logger.debug(f"Cannot extract experiment information, regarded as unprocessed: {file_path}")
+                continue
+            files_by_pair.setdefault((device_mac, experiment_id), []).append(path_str)
+        
+        if not files_by_pair:
+            return set()
+        
+        # Large scans are split into bounded batches queried concurrently
+        pairs = list(files_by_pair)
+        size = self._db_check_batch_size
+        results = await asyncio.gather(
+            *(self._query_processed_pairs(pairs[i:i + size]) for i in range(0, len(pairs), size))
+        )
+        
+        processed = set()
+        for rows in results:
+            for row in rows:
+                processed.update(files_by_pair.get((row['mac_address'], row['experiment_id']), ()))
+        return processed
+    
+    async def _query_processed_pairs(self, pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """Return the (MAC, experiment) pairs that already have packet_flows records"""
+        macs, experiment_ids = zip(*pairs)
+        check_query = """
+        SELECT c.mac_address, c.experiment_id
+        FROM unnest($1::text[], $2::text[]) AS c(mac_address, experiment_id)
+        WHERE EXISTS (
+            SELECT 1
             FROM packet_flows pf
             JOIN devices d ON pf.device_id = d.device_id
-            WHERE d.mac_address = $1 AND pf.experiment_id = $2
-            """
-            
-            result = await self.db_manager.execute_query(check_query, (device_mac, experiment_id))
-            
-            if result and result[0]['count'] > 0:
-                logger.debug(f"File processed ({result[0]['count']} records): {file_path}")
-                return True
-            else:
-                logger.debug(f"File not processed: {file_path}")
-                return False
-                
+            WHERE d.mac_address = c.mac_address AND pf.experiment_id = c.experiment_id
+        )
+        """
+        
+        try:
+            async with self._db_check_sem:
+                return await self.db_manager.execute_query(check_query, (list(macs), list(experiment_ids)))
         except Exception as e:
-            logger.warning(get_log_message('file_monitor', 'file_status_check_failed', 
-                                         component='file_monitor.database',
-                                         file_path=str(file_path), error=str(e)))
-            return False
+            logger.warning(f"Batch file status check failed, regarding {len(pairs)} file groups as unprocessed: {e}")
+            return []
     
     async def stop_monitoring(self):
         """Monitoring stop"""
@@ -1518,6 +1625,13 @@ class FileMonitorService:
         
         self.is_running = False
         
+        # Drop pending coalesced broadcasts and wait for in-flight ones
+        for handle, _ in self._pending_broadcasts.values():
+            handle.cancel()
+        self._pending_broadcasts.clear()
+        if self._coalesced_tasks:
+            await asyncio.gather(*self._coalesced_tasks, return_exceptions=True)
+        
         # Stop WebSocket broadcast worker
         if hasattr(self, '_broadcast_worker_task') and self._broadcast_worker_task:
             self._broadcast_worker_task.cancel()
@@ -1556,11 +1670,14 @@ class FileMonitorService:
     def _cleanup_log_handlers(self):
         """Clean up file monitor log handlers"""
         try:
+            # Flush queued records and stop the writer thread first
+            _stop_log_listener()
+            
             # Use the same logger instance
-            # Remove all handlers
-            for handler in logger.handlers[:]:
+            # Detach all handlers at once, then close them
+            handlers, logger.handlers = logger.handlers, []
+            for handler in handlers:
                 handler.close()
-                logger.removeHandler(handler)
             
             # Use the API logger for cleanup messages since file_monitor logger may be cleaned up
             import logging
@@ -1585,7 +1702,7 @@ class FileMonitorService:
         if self.file_handler:
             return {
                 'service_status': 'running' if self.is_running else 'stopped',
-                'monitor_directories': [str(d) for d in self.monitor_directories],
+                'monitor_directories': list(self._monitor_dir_strs),
                 'processing_stats': self.file_handler.processing_stats.copy(),
                 'queue_size': self.file_handler.processing_queue.qsize(),
                 'processed_files_count': len(self.file_handler.processed_files)
@@ -1628,7 +1745,7 @@ class FileMonitorService:
             'observer_alive': self.observer.is_alive() if self.observer else False,
             'handler_initialized': self.file_handler is not None,
             'queue_task_running': self.queue_task and not self.queue_task.done() if hasattr(self, 'queue_task') else False,
-            'monitor_directories': [str(d) for d in self.monitor_directories]
+            'monitor_directories': list(self._monitor_dir_strs)
         }
     
     async def start(self):
@@ -1641,7 +1758,6 @@ class FileMonitorService:
         """Manually trigger a scan of all monitored directories"""
         if not hasattr(self, 'monitor_directories') or not self.monitor_directories:
             # Fallback to default pcap_input directory
-            from pathlib import Path
             pcap_input_dir = get_config('file_monitor.directories.pcap_input_dir', 'pcap_input', 'file_monitor.directories')
             project_root = Path(__file__).parent.parent.parent  # Go up to project root
             monitor_directories = [project_root / pcap_input_dir]
@@ -1651,15 +1767,14 @@ class FileMonitorService:
         logger.info("Manual scan triggered")
         
         scan_start = datetime.now(self.timezone)
+        detected_time = scan_start  # One detection time per scan batch
         total_files = 0
         new_files = 0
         already_processed = 0
         
         # Scanning settings
-        ignore_hidden = get_config('file_monitor.scanning.ignore_hidden_files', 
-                                 True, 'file_monitor.scanning')
-        ignore_temp = get_config('file_monitor.scanning.ignore_temp_files', 
-                               True, 'file_monitor.scanning')
+        ignore_hidden = self._cfg.ignore_hidden
+        scan_name_match = self._cfg.scan_name_re.match
         
         for monitor_dir in monitor_directories:
             logger.info(f"Manual scanning directory: {monitor_dir}")
@@ -1668,32 +1783,20 @@ class FileMonitorService:
                 logger.warning(f"Directory not exists: {monitor_dir}")
                 continue
             
-            # Recursive scan of all subdirectories
-            for file_path in monitor_dir.rglob("*"):
-                if not file_path.is_file():
-                    continue
-                
-                # Check file extension
-                if file_path.suffix.lower() not in self.supported_extensions:
-                    continue
-                
-                # File filtering
-                if ignore_hidden and file_path.name.startswith('.'):
-                    continue
-                
-                if ignore_temp and (file_path.name.endswith('.tmp') or file_path.name.endswith('.temp')):
-                    continue
-                
+            # Recursive scan of all subdirectories with file filtering, walked in a worker thread
+            candidates = await asyncio.to_thread(_walk_and_filter, str(monitor_dir), scan_name_match,
+                                                 True, ignore_hidden)
+            for path_str in candidates:
                 total_files += 1
                 
                 # Check if file was already processed
-                if str(file_path) in self.processed_files:
+                if path_str in self.processed_files:
                     already_processed += 1
                     continue
                 
                 # Queue file for processing
                 new_files += 1
-                await self._queue_file_for_processing(file_path)
+                await self._queue_file_for_processing(Path(path_str), detected_time)
         
         scan_result = {
             'scan_time': scan_start.isoformat(),
@@ -1706,38 +1809,64 @@ class FileMonitorService:
         logger.info(f"Manual scan completed: total={total_files}, new={new_files}, processed={already_processed}")
         return scan_result
 
-    async def _queue_file_for_processing(self, file_path: Path):
-        """Add file to processing queue"""
+    async def _queue_file_for_processing(self, file_path: Path, detected_time: Optional[datetime] = None):
+        """Add file to processing queue (scans pass one detection time for the whole batch)"""
         try:
             await self.processing_queue.put({
                 'file_path': file_path,
-                'detected_time': datetime.now(self.timezone),
+                'detected_time': detected_time or datetime.now(self.timezone),
                 'retry_count': 0
             })
             
-            if get_config('file_monitor.logging.log_file_detection', True, 'file_monitor.logging'):
-                logger.info(f"Queued file for processing: {file_path}")
+            if self._cfg.log_file_detection:
+                logger.info(_LOG_QUEUED, file_path)
                 
         except Exception as e:
-            logger.error(f"Failed to queue file {file_path}: {e}")
+            logger.error(_LOG_QUEUE_FAILED, file_path, e)
     
     async def _process_queue(self):
-        """Process files from the queue"""
+        """Process files from the queue, draining bursts in bounded-concurrency batches"""
         logger.info("File processing queue started")
         
-        while self.is_running:
+        semaphore = asyncio.Semaphore(self._max_parallel_files)
+        
+        try:
+            while self.is_running:
+                try:
+                    # Wait for the next file; shutdown cancels this task
+                    first = await self.processing_queue.get()
+                    
+                    # Drain any files already waiting, up to the batch cap
+                    batch = [first]
+                    try:
+                        while len(batch) < self._batch_cap:
+                            batch.append(self.processing_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        pass
+                    
+                    await asyncio.gather(
+                        *(self._process_queued_file(file_info, semaphore) for file_info in batch),
+                        return_exceptions=True
+                    )
+                    
+                except Exception as e:
+                    logger.error(f"Queue processing error: {e}")
+                    continue
+        finally:
+            logger.info("File processing queue stopped")
+    
+    async def _process_queued_file(self, file_info: Dict, semaphore: asyncio.Semaphore):
+        """Process a single queued file under the concurrency semaphore"""
+        async with semaphore:
             try:
-                # Get file from queue with timeout
-                file_info = await asyncio.wait_for(self.processing_queue.get(), timeout=1.0)
                 file_path = file_info['file_path']
                 
-                logger.info(f"Processing file from queue: {file_path}")
+                logger.info(_LOG_PROCESSING, file_path)
                 
                 # Check if file still exists
-                if not file_path.exists():
-                    logger.warning(f"File no longer exists: {file_path}")
-                    self.processing_queue.task_done()
-                    continue
+                if not await asyncio.to_thread(file_path.exists):
+                    logger.warning(_LOG_FILE_MISSING, file_path)
+                    return
                 
                 # Process the file
                 success = await self._process_pcap_file(file_path, file_info)
@@ -1745,21 +1874,15 @@ class FileMonitorService:
                 if success:
                     self.processing_stats['files_processed'] += 1
                     self.processing_stats['last_processed'] = datetime.now(timezone.utc)
-                    logger.info(f"File processing successful: {file_path}")
+                    logger.info(_LOG_PROCESSING_OK, file_path)
                 else:
                     self.processing_stats['files_failed'] += 1
-                    logger.error(f"File processing failed: {file_path}")
-                
-                self.processing_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                # No files in queue, continue waiting
-                continue
+                    logger.error(_LOG_PROCESSING_FAILED, file_path)
+                    
             except Exception as e:
                 logger.error(f"Queue processing error: {e}")
-                continue
-        
-        logger.info("File processing queue stopped")
+            finally:
+                self.processing_queue.task_done()
     
     async def _schedule_scanner(self, directories):
         """Start the scheduled scanner using the ScheduledPCAPScanner implementation"""
@@ -7,44 +7,713 @@ import logging
 import asyncio
 import aiohttp
 import json
-from typing import Dict, Any, Optional, List, Set
-from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Set, Tuple, AsyncIterator
+from datetime import datetime, timedelta, timezone
+import sys
 import time
+import random
+from functools import lru_cache
 import ipaddress
+import socket
+import struct
+import weakref
+from collections import Counter, OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+# Add project root to Python path for the unified configuration manager
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from config.unified_config_manager import get_config
 
 logger = logging.getLogger(__name__)
 
+# Response bodies are decoded straight from bytes (both loaders accept them), skipping
+# aiohttp's intermediate str decode
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj) -> str:
+        """Serialize a request body to JSON text (orjson)"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+
+_unpack_u32 = struct.Struct('!I').unpack
+
+
+def _ipv4_to_u32(ip_address: str) -> Optional[int]:
+    """Parse a dotted IPv4 string to an unsigned 32-bit int; None for IPv6 or invalid input"""
+    try:
+        return _unpack_u32(socket.inet_pton(socket.AF_INET, ip_address))[0]
+    except (OSError, TypeError):
+        return None
+
+
+def _prefixes_to_cidrs(providers: Dict[str, List[str]]) -> Dict[str, str]:
+    """Convert dotted string prefixes ("52.", "104.16.") to CIDR blocks ("52.0.0.0/8", "104.16.0.0/16")"""
+    cidrs: Dict[str, str] = {}
+    for provider, prefixes in providers.items():
+        for prefix in prefixes:
+            octets = prefix.rstrip('.').split('.')
+            cidr = f"{'.'.join(octets + ['0'] * (4 - len(octets)))}/{8 * len(octets)}"
+            cidrs.setdefault(cidr, provider)
+    return cidrs
+
+
+def _build_cidr_table(cidrs: Dict[str, str]) -> Dict[int, List[Tuple[int, Dict[int, str]]]]:
+    """
+    Group CIDR -> provider entries by IP version and prefix length, longest first,
+    so a lookup is one masked dict probe per length.
+    On duplicate blocks the provider listed first keeps the block.
+    """
+    by_length: Dict[int, Dict[int, Dict[int, str]]] = {4: {}, 6: {}}
+    for cidr, provider in cidrs.items():
+        try:
+            network = ipaddress.ip_network(cidr, strict=False)
+        except ValueError:
+            continue
+        blocks = by_length[network.version].setdefault(network.prefixlen, {})
+        blocks.setdefault(int(network.network_address), provider)
+    
+    table = {}
+    for version, lengths in by_length.items():
+        bits = 32 if version == 4 else 128
+        all_ones = (1 << bits) - 1
+        table[version] = [
+            (all_ones ^ ((1 << (bits - length)) - 1), blocks)
+            for length, blocks in sorted(lengths.items(), reverse=True)
+        ]
+    return table
+
+
+def _lookup_cidr_table(table: Dict[int, List[Tuple[int, Dict[int, str]]]],
+                       version: int, value: int) -> Optional[str]:
+    """Longest-prefix match of an integer address against a _build_cidr_table table"""
+    for mask, blocks in table[version]:
+        provider = blocks.get(value & mask)
+        if provider is not None:
+            return provider
+    return None
+
+
+def _build_ipv4_interval_index(table: Dict[int, List[Tuple[int, Dict[int, str]]]]) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """
+    Flatten the IPv4 part of a _build_cidr_table table into disjoint sorted intervals.
+    Each interval keeps its longest-prefix-match provider (None for gaps), so a whole
+    batch is classified with one np.searchsorted call.
+    """
+    boundaries = {0}
+    for mask, blocks in table[4]:
+        host_bits = ~mask & 0xFFFFFFFF
+        for network in blocks:
+            boundaries.add(network)
+            boundaries.add((network | host_bits) + 1)
+    
+    starts: List[int] = []
+    providers: List[Optional[str]] = []
+    for boundary in sorted(boundaries):
+        if boundary > 0xFFFFFFFF:
+            continue
+        provider = _lookup_cidr_table(table, 4, boundary)
+        # Merge neighbours with the same answer
+        if providers and providers[-1] == provider:
+            continue
+        starts.append(boundary)
+        providers.append(provider)
+    return np.array(starts, dtype=np.uint32), providers
+
+
+def _lookup_ipv4_interval_index(index: Tuple[np.ndarray, List[Optional[str]]],
+                                values: np.ndarray) -> List[Optional[str]]:
+    """Provider for each uint32 address in values against a _build_ipv4_interval_index index"""
+    starts, providers = index
+    positions = np.searchsorted(starts, values, side='right') - 1
+    return [providers[i] for i in positions.tolist()]
+
+
+def _build_published_cloud_tables(cidrs: Dict[str, str]):
+    """Build the LPM table and its IPv4 interval index together (run off the event loop)"""
+    table = _build_cidr_table(cidrs)
+    return table, _build_ipv4_interval_index(table)
+
+
+def _parse_aws_ranges(data: Dict[str, Any]) -> List[str]:
+    return ([p['ip_prefix'] for p in data.get('prefixes', ())] +
+            [p['ipv6_prefix'] for p in data.get('ipv6_prefixes', ())])
+
+
+def _parse_gcp_ranges(data: Dict[str, Any]) -> List[str]:
+    return [p.get('ipv4Prefix') or p.get('ipv6Prefix') for p in data.get('prefixes', ())]
+
+
+# Published provider range files: (provider, url, parser); parser None means one CIDR per line
+_CLOUD_RANGE_SOURCES = (
+    ('AWS', 'https://ip-ranges.amazonaws.com/ip-ranges.json', _parse_aws_ranges),
+    ('Google Cloud', 'https://www.gstatic.com/ipranges/cloud.json', _parse_gcp_ranges),
+    ('Cloudflare', 'https://www.cloudflare.com/ips-v4', None),
+    ('Cloudflare', 'https://www.cloudflare.com/ips-v6', None),
+)
+
+
+def _ipv4_networks(cidrs: List[str]) -> Tuple[Tuple[int, int], ...]:
+    """Pre-parse IPv4 CIDR strings into (network, netmask) integer pairs"""
+    networks = (ipaddress.IPv4Network(cidr) for cidr in cidrs)
+    return tuple((int(n.network_address), int(n.netmask)) for n in networks)
+
+
+# Non-global IPv4 ranges (ipaddress' is_private set plus 100.64/10 carrier-grade NAT)
+_PRIVATE_IPV4_NETWORKS = _ipv4_networks([
+    '10.0.0.0/8', '172.16.0.0/12', '192.168.0.0/16', '127.0.0.0/8',
+    '169.254.0.0/16', '100.64.0.0/10', '0.0.0.0/8', '192.0.0.0/29',
+    '192.0.0.170/31', '192.0.2.0/24', '198.18.0.0/15', '198.51.100.0/24',
+    '203.0.113.0/24', '240.0.0.0/4', '255.255.255.255/32',
+])
+
+def _location_detail_sql(row: str) -> str:
+    """SQL score of how much a cache row knows: a real country and a real city count one each"""
+    return (f"(({row}.country_code IS NOT NULL AND {row}.country_code NOT IN ('UN', 'CS'))::int"
+            f" + ({row}.city IS NOT NULL AND {row}.city NOT IN ('Unknown', 'Cloud'))::int)")
+
+
+_PRIVATE_IPV4_NETS = np.array([network for network, _ in _PRIVATE_IPV4_NETWORKS], dtype=np.uint32)
+_PRIVATE_IPV4_MASKS = np.array([netmask for _, netmask in _PRIVATE_IPV4_NETWORKS], dtype=np.uint32)
+
+
+def _private_ipv4_flags(values: np.ndarray) -> np.ndarray:
+    """Vectorized private-range test for an array of uint32 addresses"""
+    return ((values[:, None] & _PRIVATE_IPV4_MASKS) == _PRIVATE_IPV4_NETS).any(axis=1)
+
+
+# ip_geolocation_cache columns written by the cache paths, and their merge rule:
+# every write bumps last_updated (the refresh was attempted, so the row is not stale again
+# straight away), but a refresh never replaces location data with an answer that knows
+# less (e.g. an API failure fallback)
+_CACHE_COLUMNS = (
+    'ip_address', 'country_code', 'country_name', 'region', 'city',
+    'latitude', 'longitude', 'isp', 'organization'
+)
+_CACHE_KEEP_EXISTING_SQL = (
+    f"{_location_detail_sql('EXCLUDED')} < {_location_detail_sql('ip_geolocation_cache')}"
+)
+_CACHE_CONFLICT_CLAUSE = """
+ON CONFLICT (ip_address) 
+DO UPDATE SET
+{assignments},
+    last_updated = CURRENT_TIMESTAMP
+""".format(assignments=',\n'.join(
+    f"    {column} = CASE WHEN {_CACHE_KEEP_EXISTING_SQL}"
+    f" THEN ip_geolocation_cache.{column} ELSE EXCLUDED.{column} END"
+    for column in _CACHE_COLUMNS[1:]
+))
+
+# Location fields whose values repeat across many IPs (pooled in the memory cache)
+_POOLED_FIELDS = ('country', 'countryCode', 'region', 'city', 'isp', 'org')
+
+# Well-known public DNS resolvers answered without any lookup
+_KNOWN_DNS_SERVERS = frozenset({'8.8.8.8', '8.8.4.4', '1.1.1.1', '1.0.0.1'})
+
+# Read-only result templates for the fast paths; callers get {'ip': ..., **template}
+_PRIVATE_LOCATION = MappingProxyType({
+    'country': 'Local Network',
+    'countryCode': 'LN',
+    'region': 'Private',
+    'city': 'Local',
+    'lat': None,
+    'lon': None,
+    'isp': 'Local Network',
+    'org': 'Private Network',
+    'cached': False,
+    'source': 'local_detection'
+})
+_KNOWN_SERVICE_LOCATION = MappingProxyType({
+    'country': 'United States',
+    'countryCode': 'US',
+    'region': 'DNS Service',
+    'city': 'DNS',
+    'lat': None,
+    'lon': None,
+    'isp': 'DNS Provider',
+    'org': 'Public DNS',
+    'cached': False,
+    'source': 'known_service'
+})
+_UNKNOWN_LOCATION = MappingProxyType({
+    'country': 'Unknown',
+    'countryCode': 'UN',
+    'region': 'Unknown',
+    'city': 'Unknown',
+    'lat': None,
+    'lon': None,
+    'isp': 'Unknown',
+    'org': 'Unknown',
+    'cached': False,
+    'source': 'fallback'
+})
+_FAST_FALLBACK_LOCATION = MappingProxyType({
+    'country': 'Internet',
+    'countryCode': 'IN',
+    'region': 'External',
+    'city': 'Internet',
+    'lat': None,
+    'lon': None,
+    'isp': 'Internet Service',
+    'org': 'External Network',
+    'cached': False,
+    'source': 'fallback_fast'
+})
+# Cloud results also need the provider in 'region'/'isp'/'org' (see _cloud_location)
+_CLOUD_LOCATION = MappingProxyType({
+    'country': 'Cloud Service',
+    'countryCode': 'CS',
+    'city': 'Cloud',
+    'lat': None,
+    'lon': None,
+    'cached': False,
+    'source': 'cloud_detection'
+})
+
+
+def _cloud_location(ip_address: str, cloud_provider: str) -> Dict[str, Any]:
+    """Location reported for an address inside a cloud provider's ranges"""
+    return {
+        'ip': ip_address, **_CLOUD_LOCATION,
+        'region': cloud_provider, 'isp': cloud_provider, 'org': f'{cloud_provider} Cloud'
+    }
+
+
+class _TokenBucket:
+    """Token bucket refilled continuously at rate_limit tokens per window"""
+    
+    def __init__(self, rate_limit: int, window_seconds: float):
+        self.capacity = float(rate_limit)
+        self.rate = rate_limit / window_seconds
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, max_wait: float) -> bool:
+        """Take one token, sleeping until it is available; False if that would exceed max_wait"""
+        self._refill()
+        wait = (1.0 - self.tokens) / self.rate
+        if wait > max_wait:
+            return False
+        # Reserve before sleeping so concurrent callers queue behind this one
+        self.tokens -= 1.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+    
+    def penalize(self, seconds: float):
+        """Empty the bucket so no token is available for the given number of seconds"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+# Comprehensive country name standardization mapping, keyed by lowercased name
+_COUNTRY_STANDARDIZATION = {
+    # English-speaking countries
+    'united states': 'United States',
+    'usa': 'United States', 
+    'united states of america': 'United States',
+    'us': 'United States',
+    'united kingdom': 'United Kingdom',
+    'uk': 'United Kingdom',
+    'great britain': 'United Kingdom',
+    'england': 'United Kingdom',
+    'scotland': 'United Kingdom',
+    'wales': 'United Kingdom',
+    'northern ireland': 'United Kingdom',
+    'australia': 'Australia',
+    'canada': 'Canada',
+    'new zealand': 'New Zealand',
+    'ireland': 'Ireland',
+    'republic of ireland': 'Ireland',
+    'south africa': 'South Africa',
+    
+    # European countries
+    'the netherlands': 'Netherlands',
+    'netherlands': 'Netherlands',
+    'holland': 'Netherlands',
+    'germany': 'Germany',
+    'deutschland': 'Germany',
+    'france': 'France',
+    'italia': 'Italy',
+    'italy': 'Italy',
+    'spain': 'Spain',
+    'espana': 'Spain',
+    'españa': 'Spain',
+    'portugal': 'Portugal',
+    'switzerland': 'Switzerland',
+    'austria': 'Austria',
+    'belgium': 'Belgium',
+    'luxembourg': 'Luxembourg',
+    'denmark': 'Denmark',
+    'sweden': 'Sweden',
+    'norway': 'Norway',
+    'finland': 'Finland',
+    'poland': 'Poland',
+    'czech republic': 'Czech Republic',
+    'czechia': 'Czech Republic',
+    'slovakia': 'Slovakia',
+    'hungary': 'Hungary',
+    'slovenia': 'Slovenia',
+    'croatia': 'Croatia',
+    'bosnia and herzegovina': 'Bosnia and Herzegovina',
+    'serbia': 'Serbia',
+    'montenegro': 'Montenegro',
+    'macedonia': 'North Macedonia',
+    'north macedonia': 'North Macedonia',
+    'albania': 'Albania',
+    'greece': 'Greece',
+    'bulgaria': 'Bulgaria',
+    'romania': 'Romania',
+    'lithuania': 'Lithuania',
+    'latvia': 'Latvia',
+    'estonia': 'Estonia',
+    'belarus': 'Belarus',
+    'ukraine': 'Ukraine',
+    'moldova': 'Moldova',
+    'moldova, republic of': 'Moldova',
+    'russian federation': 'Russia',
+    'russia': 'Russia',
+    
+    # Asian countries
+    'china': 'China',
+    'people\'s republic of china': 'China',
+    'prc': 'China',
+    'japan': 'Japan',
+    'south korea': 'South Korea',
+    'korea, republic of': 'South Korea',
+    'republic of korea': 'South Korea',
+    'north korea': 'North Korea',
+    'korea, democratic people\'s republic of': 'North Korea',
+    'democratic people\'s republic of korea': 'North Korea',
+    'india': 'India',
+    'pakistan': 'Pakistan',
+    'bangladesh': 'Bangladesh',
+    'sri lanka': 'Sri Lanka',
+    'myanmar': 'Myanmar',
+    'burma': 'Myanmar',
+    'thailand': 'Thailand',
+    'vietnam': 'Vietnam',
+    'viet nam': 'Vietnam',
+    'cambodia': 'Cambodia',
+    'laos': 'Laos',
+    'singapore': 'Singapore',
+    'malaysia': 'Malaysia',
+    'indonesia': 'Indonesia',
+    'philippines': 'Philippines',
+    'brunei': 'Brunei',
+    'taiwan': 'Taiwan',
+    'taiwan, province of china': 'Taiwan',
+    'hong kong': 'Hong Kong',
+    'hong kong sar china': 'Hong Kong',
+    'macau': 'Macao',
+    'macao': 'Macao',
+    'macao sar china': 'Macao',
+    
+    # Middle Eastern countries
+    'iran': 'Iran',
+    'iran, islamic republic of': 'Iran',
+    'islamic republic of iran': 'Iran',
+    'iraq': 'Iraq',
+    'afghanistan': 'Afghanistan',
+    'turkey': 'Turkey',
+    'syria': 'Syria',
+    'syrian arab republic': 'Syria',
+    'lebanon': 'Lebanon',
+    'jordan': 'Jordan',
+    'israel': 'Israel',
+    'palestine': 'Palestine',
+    'palestine, state of': 'Palestine',
+    'state of palestine': 'Palestine',
+    'saudi arabia': 'Saudi Arabia',
+    'united arab emirates': 'United Arab Emirates',
+    'uae': 'United Arab Emirates',
+    'qatar': 'Qatar',
+    'kuwait': 'Kuwait',
+    'bahrain': 'Bahrain',
+    'oman': 'Oman',
+    'yemen': 'Yemen',
+    
+    # African countries
+    'egypt': 'Egypt',
+    'libya': 'Libya',
+    'tunisia': 'Tunisia',
+    'algeria': 'Algeria',
+    'morocco': 'Morocco',
+    'sudan': 'Sudan',
+    'ethiopia': 'Ethiopia',
+    'kenya': 'Kenya',
+    'uganda': 'Uganda',
+    'tanzania': 'Tanzania',
+    'tanzania, united republic of': 'Tanzania',
+    'united republic of tanzania': 'Tanzania',
+    'zimbabwe': 'Zimbabwe',
+    'zambia': 'Zambia',
+    'botswana': 'Botswana',
+    'namibia': 'Namibia',
+    'ghana': 'Ghana',
+    'nigeria': 'Nigeria',
+    'senegal': 'Senegal',
+    'mali': 'Mali',
+    'burkina faso': 'Burkina Faso',
+    'ivory coast': 'Ivory Coast',
+    'cote d\'ivoire': 'Ivory Coast',
+    'cameroon': 'Cameroon',
+    'chad': 'Chad',
+    'central african republic': 'Central African Republic',
+    'democratic republic of the congo': 'Democratic Republic of the Congo',
+    'republic of the congo': 'Republic of the Congo',
+    'gabon': 'Gabon',
+    'equatorial guinea': 'Equatorial Guinea',
+    'madagascar': 'Madagascar',
+    
+    # South American countries
+    'brazil': 'Brazil',
+    'argentina': 'Argentina',
+    'chile': 'Chile',
+    'peru': 'Peru',
+    'colombia': 'Colombia',
+    'venezuela': 'Venezuela',
+    'venezuela, bolivarian republic of': 'Venezuela',
+    'bolivarian republic of venezuela': 'Venezuela',
+    'ecuador': 'Ecuador',
+    'bolivia': 'Bolivia',
+    'bolivia, plurinational state of': 'Bolivia',
+    'plurinational state of bolivia': 'Bolivia',
+    'paraguay': 'Paraguay',
+    'uruguay': 'Uruguay',
+    'guyana': 'Guyana',
+    'suriname': 'Suriname',
+    'french guiana': 'French Guiana',
+    
+    # Special territories and city-states
+    'vatican': 'Vatican City',
+    'vatican city': 'Vatican City',
+    'holy see (vatican city state)': 'Vatican City',
+    'holy see': 'Vatican City',
+    'monaco': 'Monaco',
+    'san marino': 'San Marino',
+    'liechtenstein': 'Liechtenstein',
+    'andorra': 'Andorra',
+    'gibraltar': 'Gibraltar',
+    'bermuda': 'Bermuda',
+    'puerto rico': 'Puerto Rico',
+    'guam': 'Guam',
+    'virgin islands': 'Virgin Islands',
+    'cayman islands': 'Cayman Islands',
+    'bahamas': 'Bahamas',
+    'barbados': 'Barbados',
+    'jamaica': 'Jamaica',
+    'trinidad and tobago': 'Trinidad and Tobago',
+    'martinique': 'Martinique',
+    'guadeloupe': 'Guadeloupe',
+    'aruba': 'Aruba',
+    'netherlands antilles': 'Netherlands Antilles',
+    'curacao': 'Curacao',
+    'curaçao': 'Curacao',
+    'saint lucia': 'Saint Lucia',
+    'grenada': 'Grenada',
+    'dominica': 'Dominica',
+    'antigua and barbuda': 'Antigua and Barbuda',
+    'saint kitts and nevis': 'Saint Kitts and Nevis',
+    'saint vincent and the grenadines': 'Saint Vincent and the Grenadines',
+    'dominican republic': 'Dominican Republic',
+    'haiti': 'Haiti',
+    'cuba': 'Cuba',
+    
+    # Pacific region
+    'fiji': 'Fiji',
+    'papua new guinea': 'Papua New Guinea',
+    'solomon islands': 'Solomon Islands',
+    'vanuatu': 'Vanuatu',
+    'new caledonia': 'New Caledonia',
+    'french polynesia': 'French Polynesia',
+    'samoa': 'Samoa',
+    'tonga': 'Tonga',
+    'palau': 'Palau',
+    'micronesia': 'Micronesia',
+    'marshall islands': 'Marshall Islands',
+    'kiribati': 'Kiribati',
+    'tuvalu': 'Tuvalu',
+    'nauru': 'Nauru',
+    'cook islands': 'Cook Islands',
+    'niue': 'Niue',
+    'tokelau': 'Tokelau',
+    'american samoa': 'American Samoa',
+    'northern mariana islands': 'Northern Mariana Islands',
+    
+    # Other regions
+    'greenland': 'Greenland',
+    'iceland': 'Iceland',
+    'faroe islands': 'Faroe Islands',
+    'åland islands': 'Åland Islands',
+    'aland islands': 'Åland Islands',
+    'svalbard and jan mayen': 'Svalbard and Jan Mayen',
+    'isle of man': 'Isle of Man',
+    'jersey': 'Jersey',
+    'guernsey': 'Guernsey',
+    'falkland islands': 'Falkland Islands',
+    'south georgia and the south sandwich islands': 'South Georgia and the South Sandwich Islands',
+    'british indian ocean territory': 'British Indian Ocean Territory',
+    'christmas island': 'Christmas Island',
+    'cocos islands': 'Cocos Islands',
+    'norfolk island': 'Norfolk Island',
+    'heard island and mcdonald islands': 'Heard Island and McDonald Islands',
+    'antarctica': 'Antarctica',
+    'bouvet island': 'Bouvet Island',
+    'french southern territories': 'French Southern Territories',
+    'mayotte': 'Mayotte',
+    'reunion': 'Reunion',
+    'réunion': 'Reunion',
+    'saint helena': 'Saint Helena',
+    'ascension and tristan da cunha': 'Ascension and Tristan da Cunha',
+    'western sahara': 'Western Sahara',
+    'pitcairn': 'Pitcairn',
+    'turks and caicos islands': 'Turks and Caicos Islands',
+    'british virgin islands': 'British Virgin Islands',
+    'anguilla': 'Anguilla',
+    'montserrat': 'Montserrat',
+    'saint pierre and miquelon': 'Saint Pierre and Miquelon',
+    'wallis and futuna': 'Wallis and Futuna',
+    'saint martin': 'Saint Martin',
+    'sint maarten': 'Sint Maarten',
+    'saint barthelemy': 'Saint Barthelemy',
+    'saint barthélemy': 'Saint Barthelemy'
+}
+
+# Share one string object per canonical name across every cached location dict
+_COUNTRY_STANDARDIZATION = {alias: sys.intern(name) for alias, name in _COUNTRY_STANDARDIZATION.items()}
+
+
+@lru_cache(maxsize=1024)
+def _standardize_country_cached(country_name: str) -> str:
+    """Standardized name if known, otherwise original name (first letter capitalized)"""
+    return _COUNTRY_STANDARDIZATION.get(country_name.casefold().strip()) or sys.intern(country_name.title())
+
 
 class IPGeolocationService:
     """IP geolocation service"""
     
+    # Published cloud provider ranges, shared by every instance and refreshed in the background
+    _published_cloud_table: Optional[Dict[int, List[Tuple[int, Dict[int, str]]]]] = None
+    _published_cloud_index: Optional[Tuple[np.ndarray, List[Optional[str]]]] = None
+    # One keep-alive HTTP session per event loop, shared by every instance on that loop
+    _shared_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = \
+        weakref.WeakKeyDictionary()
+    # In-process LRU in front of the database cache, shared so it outlives per-request
+    # instances: ip -> (expires_at, location); plus the string pool its entries use
+    _shared_memory_cache: "OrderedDict[str, tuple]" = OrderedDict()
+    _shared_str_pool: Dict[str, str] = {}
+    # TinyLFU-style admission for that LRU: recent access counts per IP (halved periodically)
+    # keep one-off scans from evicting frequently used entries
+    _access_counts: Counter = Counter()
+    _access_total = 0
+    _memory_cache_stats = {'hits': 0, 'misses': 0, 'rejected': 0}
+    # Stale cache rows being re-resolved in the background, and the tasks doing it
+    _refreshing_ips: Set[str] = set()
+    _refresh_tasks: Set[asyncio.Task] = set()
+    # Single-IP cache writes from every instance, written in the background by one flush task
+    _pending_cache_writes: Dict[str, Dict[str, Any]] = {}
+    _cache_flush_task: Optional[asyncio.Task] = None
+    # Uncached lookups running on each event loop (ip -> future of its location), so
+    # concurrent lookups from any instance share one provider query per IP
+    _inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = \
+        weakref.WeakKeyDictionary()
+    # Provider quota buckets per event loop, shared so back-to-back and concurrent requests
+    # draw from one quota: loop -> (per-IP buckets, batch buckets), each keyed by provider
+    _shared_rate_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]" = \
+        weakref.WeakKeyDictionary()
+    # Provider fail-over state, shared so a failing provider stays cooled down across requests:
+    # consecutive failures, and the monotonic time each provider is usable again
+    _provider_failures: Dict[str, int] = {}
+    _provider_cooldown: Dict[str, float] = {}
+    # provider -> monotonic time of its last 429, shared so throttling outlives an instance
+    _throttled_at: Dict[str, float] = {}
+    _cloud_ranges_next_refresh = 0.0
+    _cloud_refresh_task: Optional[asyncio.Task] = None
+    
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.cache_duration_hours = 168  # 7 days cache
+        self.bulk_copy_threshold = 500  # Cache writes at or above this size use COPY instead of unnest
+        self.cache_lookup_join_threshold = 1000  # Cache reads above this size join against unnest() instead of = ANY
+        self.cache_lookup_chunk_size = 5000  # Cache reads above this size are split and run concurrently
         self.session = None
+        self._cutoff_cache: Tuple[float, Optional[datetime]] = (0.0, None)  # (monotonic stamp, cutoff)
+        
+        # Process-wide LRU in front of the database cache (see _shared_memory_cache)
+        self.memory_cache_size = 50000
+        self.memory_cache_ttl = 3600
+        self._memory_cache = IPGeolocationService._shared_memory_cache
+        # Dedup pool for the low-cardinality strings held by cached locations
+        self.str_pool_size = 4096
+        self._str_pool = IPGeolocationService._shared_str_pool
+        # Single-IP cache writes arriving within cache_write_window share one bulk upsert
+        self.cache_write_window = 0.05
         
         # Supported geolocation API providers
         self.providers = {
             'ip-api': {
                 'url': 'http://ip-api.com/json/{ip}',
                 'rate_limit': 45,  # Requests per minute
+                'rate_window': 60,
+                'batch_url': 'http://ip-api.com/batch',
+                'batch_size': 100,  # IPs per batch request
+                'batch_rate_limit': 15,  # Batch requests per minute
                 'fields': 'status,message,country,countryCode,region,regionName,city,lat,lon,timezone,isp,org,query'
             },
             'ipapi': {
                 'url': 'https://ipapi.co/{ip}/json/',
                 'rate_limit': 1000,  # Free requests per day
+                'rate_window': 86400,
                 'fields': None
             },
             'freegeoip': {
                 'url': 'https://freegeoip.app/json/{ip}',
                 'rate_limit': 15000,  # Requests per hour
+                'rate_window': 3600,
                 'fields': None
             }
         }
         
-        self.current_provider = 'ip-api'  # Default to ip-api
-        self.request_count = 0
-        self.last_reset_time = time.time()
+        # Default to ip-api, unless earlier requests have put it on cooldown
+        now = time.monotonic()
+        self.current_provider = next(
+            (name for name in self.providers
+             if IPGeolocationService._provider_cooldown.get(name, 0.0) <= now),
+            'ip-api'
+        )
+        
+        # Response parser per provider, resolved once instead of branching per response
+        self._parsers = {
+            'ip-api': self._parse_ip_api,
+            'ipapi': self._parse_ipapi,
+            'freegeoip': self._parse_freegeoip
+        }
+        
+        # Provider fail-over: consecutive failures put a provider on cooldown
+        self.provider_failure_threshold = 2
+        self.provider_cooldown_seconds = 60
+        self.max_api_lookups = 100  # Larger miss sets use the fast fallback instead of per-IP requests
+        self.max_api_batches = 5  # ...or this many batch requests for providers with a batch endpoint
+        self.api_concurrency = 32  # Max in-flight API requests during bulk lookups
+        self.throttled_api_concurrency = 4  # ...while the provider has returned 429 within throttle_window
+        self.throttle_window = 60
         
         # Known cloud service provider IP ranges
         self.cloud_providers = {
@@ -55,33 +724,180 @@ class IPGeolocationService:
             'Akamai': ['23.', '184.', '72.'],
             'DigitalOcean': ['128.199.', '159.65.', '167.99.', '206.189.']
         }
+        # Longest-prefix-match table built once from the prefixes above
+        self._cloud_cidr_table = _build_cidr_table(_prefixes_to_cidrs(self.cloud_providers))
+        self._cloud_interval_index = _build_ipv4_interval_index(self._cloud_cidr_table)
+        # Downloading the providers' published range files is opt-in (outbound requests)
+        self.fetch_published_cloud_ranges = get_config(
+            'ip_geolocation.fetch_published_cloud_ranges', False, 'ip_geolocation'
+        )
     
-    def _identify_cloud_provider(self, ip_address: str) -> Optional[str]:
-        """Identify cloud service provider"""
-        for provider, prefixes in self.cloud_providers.items():
-            if any(ip_address.startswith(prefix) for prefix in prefixes):
+    def _identify_cloud_provider(self, ip_address: str, ip_u32: Optional[int] = None) -> Optional[str]:
+        """Identify cloud service provider (longest prefix match, published ranges first)"""
+        if ip_u32 is not None:
+            version, value = 4, ip_u32
+        else:
+            try:
+                ip = ipaddress.ip_address(ip_address)
+            except ValueError:
+                return None
+            version, value = ip.version, int(ip)
+        
+        published = IPGeolocationService._published_cloud_table
+        if published is not None:
+            provider = _lookup_cidr_table(published, version, value)
+            if provider is not None:
                 return provider
-        return None
+        return _lookup_cidr_table(self._cloud_cidr_table, version, value)
     
-    def _is_private_ip(self, ip_address: str) -> bool:
+    def _schedule_cloud_range_refresh(self):
+        """Start a background download of published provider ranges when the shared table is stale"""
+        cls = IPGeolocationService
+        if not self.fetch_published_cloud_ranges or time.monotonic() < cls._cloud_ranges_next_refresh:
+            return
+        loop = asyncio.get_running_loop()
+        task = cls._cloud_refresh_task
+        # A task left on another (closed) event loop will never finish; replace it
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        cls._cloud_refresh_task = loop.create_task(self._refresh_cloud_ranges())
+    
+    async def _refresh_cloud_ranges(self):
+        """Download every published provider range file and swap in a new shared CIDR table"""
+        cls = IPGeolocationService
+        cidrs: Dict[str, str] = {}
+        failed = False
+        logger.info(f"Fetching published cloud provider IP ranges from "
+                    f"{', '.join(provider for provider, _, _ in _CLOUD_RANGE_SOURCES)}")
+        # Own session: the instance session may be closed before this finishes
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30)) as session:
+            for provider, url, parser in _CLOUD_RANGE_SOURCES:
+                try:
+                    async with session.get(url) as response:
+                        if response.status != 200:
+                            raise RuntimeError(f"status {response.status}")
+                        if parser is None:
+                            ranges = (await response.text()).split()
+                        else:
+                            ranges = parser(_json_loads(await response.read()))
+                    for cidr in ranges:
+                        if cidr:
+                            cidrs.setdefault(cidr, provider)
+                except Exception as e:
+                    failed = True
+                    logger.warning(f"Could not load {provider} IP ranges from {url}: {e}")
+        
+        if cidrs:
+            cls._published_cloud_table, cls._published_cloud_index = await asyncio.to_thread(
+                _build_published_cloud_tables, cidrs
+            )
+            logger.info(f"Loaded {len(cidrs)} published cloud provider IP ranges")
+        # Retry sooner after a failure, otherwise refresh daily
+        cls._cloud_ranges_next_refresh = time.monotonic() + (3600 if failed else 86400)
+    
+    def _is_private_ip(self, ip_address: str, ip_u32: Optional[int] = None) -> bool:
         """Check if it is a private IP address"""
-        try:
-            ip = ipaddress.ip_address(ip_address)
-            return ip.is_private
-        except ValueError:
-            return False
+        if ip_u32 is None:
+            ip_u32 = _ipv4_to_u32(ip_address)
+            if ip_u32 is None:
+                # Not dotted IPv4: let ipaddress handle IPv6 and reject garbage
+                try:
+                    return ipaddress.ip_address(ip_address).is_private
+                except ValueError:
+                    return False
+        return any(ip_u32 & netmask == network for network, netmask in _PRIVATE_IPV4_NETWORKS)
+    
+    def _classify_ips(self, ip_addresses: List[str],
+                      ip_u32s: List[Optional[int]]) -> Tuple[List[bool], List[Optional[str]]]:
+        """
+        Batch form of _is_private_ip and _identify_cloud_provider.
+        IPv4 addresses are packed into one uint32 array: the private test is a broadcast mask
+        and only the public remainder is searched against the cloud interval indexes
+        """
+        private_flags = [False] * len(ip_addresses)
+        cloud_providers: List[Optional[str]] = [None] * len(ip_addresses)
+        for i, ip_u32 in enumerate(ip_u32s):
+            if ip_u32 is None:
+                ip = ip_addresses[i]
+                private_flags[i] = self._is_private_ip(ip)
+                if not private_flags[i]:
+                    cloud_providers[i] = self._identify_cloud_provider(ip)
+        
+        v4_positions, values = self._split_ipv4_batch(ip_u32s)
+        if not v4_positions:
+            return private_flags, cloud_providers
+        
+        private = _private_ipv4_flags(values)
+        for i in np.flatnonzero(private).tolist():
+            private_flags[v4_positions[i]] = True
+        public = np.flatnonzero(~private)
+        if not len(public):
+            return private_flags, cloud_providers
+        
+        public_values = values[public]
+        providers = _lookup_ipv4_interval_index(self._cloud_interval_index, public_values)
+        published_index = IPGeolocationService._published_cloud_index
+        if published_index is not None:
+            published = _lookup_ipv4_interval_index(published_index, public_values)
+            providers = [p if p is not None else s for p, s in zip(published, providers)]
+        for i, provider in zip(public.tolist(), providers):
+            cloud_providers[v4_positions[i]] = provider
+        return private_flags, cloud_providers
+    
+    @staticmethod
+    def _split_ipv4_batch(ip_u32s: List[Optional[int]]) -> Tuple[List[int], np.ndarray]:
+        """Positions of the parsed IPv4 addresses in a batch, and their values as a uint32 array"""
+        positions = [i for i, ip_u32 in enumerate(ip_u32s) if ip_u32 is not None]
+        return positions, np.array([ip_u32s[i] for i in positions], dtype=np.uint32)
+    
+    def _known_service_location(self, ip_address: str) -> Dict[str, Any]:
+        """Location record for a well-known public DNS resolver"""
+        return {'ip': ip_address, **_KNOWN_SERVICE_LOCATION}
     
     async def get_session(self):
-        """Get or create HTTP session"""
-        if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=5)  # Reduce timeout
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        return self.session
+        """Get or create the HTTP session shared by all instances on the running event loop"""
+        loop = asyncio.get_running_loop()
+        session = IPGeolocationService._shared_sessions.get(loop)
+        if session is None or session.closed:
+            timeout = aiohttp.ClientTimeout(total=5, connect=2, sock_read=3)  # Reduce timeout
+            # Keep-alive and DNS caching let bulk lookups reuse connections to the provider
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=32,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+                enable_cleanup_closed=True
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                            json_serialize=_json_dumps)
+            IPGeolocationService._shared_sessions[loop] = session
+        self.session = session
+        return session
     
     async def close_session(self):
-        """Close HTTP session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Release this instance's HTTP session; the shared session stays open for other instances"""
+        self.session = None
+    
+    @classmethod
+    async def close_shared_session(cls):
+        """Close the HTTP session shared on the running event loop (application shutdown)"""
+        loop = asyncio.get_running_loop()
+        # Let background refreshes on this loop finish with the session first
+        pending = [task for task in cls._refresh_tasks if task.get_loop() is loop]
+        # ...and queued cache writes reach the database
+        if cls._cache_flush_task is not None and cls._cache_flush_task.get_loop() is loop:
+            pending.append(cls._cache_flush_task)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        session = cls._shared_sessions.pop(loop, None)
+        if session is not None and not session.closed:
+            await session.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close_session()
     
     async def get_location(self, ip_address: str) -> Optional[Dict[str, Any]]:
         """Get geolocation information for a single IP address"""
@@ -95,96 +911,233 @@ class IPGeolocationService:
         try:
             # Check if it is a private IP
             if self._is_private_ip(ip_address):
-                return {
-                    'ip': ip_address,
-                    'country': 'Local Network',
-                    'countryCode': 'LN',
-                    'region': 'Private',
-                    'city': 'Local',
-                    'lat': None,
-                    'lon': None,
-                    'isp': 'Local Network',
-                    'org': 'Private Network',
-                    'cached': False,
-                    'source': 'local_detection'
-                }
+                return {'ip': ip_address, **_PRIVATE_LOCATION}
+            
+            if ip_address in _KNOWN_DNS_SERVERS:
+                return self._known_service_location(ip_address)
+            
+            self._schedule_cloud_range_refresh()
+            
+            # Hot IPs are served from memory without a database round trip
+            location = self._memory_cache_get(ip_address)
+            if location:
+                return location
             
             # Prioritize local reference database
-            local_location = await self._query_local_reference_db(ip_address)
-            if local_location:
+            location = await self._query_local_reference_db(ip_address)
+            if location:
                 logger.debug(f"Using local reference database for IP {ip_address}")
-                return local_location
-            
-            # Check old cache
-            cached_location = await self._get_cached_location(ip_address)
-            if cached_location:
-                logger.debug(f"Using cached location for IP {ip_address}")
-                return cached_location
-            
-            # Query API (as a fallback)
-            location_data = await self._query_api_location(ip_address)
-            if location_data:
-                # Store to cache
-                await self._cache_location(ip_address, location_data)
-                return location_data
-            
-            # If API query fails, return fallback information based on cloud service provider
-            cloud_provider = self._identify_cloud_provider(ip_address)
-            if cloud_provider:
-                fallback_location = {
-                    'ip': ip_address,
-                    'country': 'Cloud Service',
-                    'countryCode': 'CS',
-                    'region': cloud_provider,
-                    'city': 'Cloud',
-                    'lat': None,
-                    'lon': None,
-                    'isp': cloud_provider,
-                    'org': f'{cloud_provider} Cloud',
-                    'cached': False,
-                    'source': 'cloud_detection'
-                }
-                # Cache fallback information
-                await self._cache_location(ip_address, fallback_location)
-                return fallback_location
-            
-            # Final fallback
-            fallback_location = {
-                'ip': ip_address,
-                'country': 'Unknown',
-                'countryCode': 'UN',
-                'region': 'Unknown',
-                'city': 'Unknown',
-                'lat': None,
-                'lon': None,
-                'isp': 'Unknown',
-                'org': 'Unknown',
-                'cached': False,
-                'source': 'fallback'
-            }
-            await self._cache_location(ip_address, fallback_location)
-            return fallback_location
+            else:
+                # Check old cache
+                location = await self._get_cached_location(ip_address)
+                if location:
+                    logger.debug(f"Using cached location for IP {ip_address}")
+                else:
+                    location = await self._resolve_coalesced(ip_address)
+            
+            if location and not location.get('stale'):
+                self._memory_cache_put(ip_address, location)
+            return location
             
         except Exception as e:
             logger.error(f"Error getting location for IP {ip_address}: {e}")
             return None
     
+    def _loop_rate_limiters(self) -> Tuple[Dict[str, _TokenBucket], Dict[str, _TokenBucket]]:
+        """Per-IP and batch quota buckets for the running event loop, created on first use"""
+        cls = IPGeolocationService
+        loop = asyncio.get_running_loop()
+        limiters = cls._shared_rate_limiters.get(loop)
+        if limiters is None:
+            limiters = cls._shared_rate_limiters[loop] = (
+                {
+                    name: _TokenBucket(config['rate_limit'], config['rate_window'])
+                    for name, config in self.providers.items()
+                },
+                {
+                    name: _TokenBucket(config['batch_rate_limit'], config['rate_window'])
+                    for name, config in self.providers.items()
+                    if self._supports_batch(name)
+                }
+            )
+        return limiters
+    
+    @property
+    def _rate_limiters(self) -> Dict[str, _TokenBucket]:
+        """Per-IP request buckets shared by every instance on the running event loop"""
+        return self._loop_rate_limiters()[0]
+    
+    @property
+    def _batch_rate_limiters(self) -> Dict[str, _TokenBucket]:
+        """Batch request buckets shared by every instance on the running event loop"""
+        return self._loop_rate_limiters()[1]
+    
+    @classmethod
+    def _inflight_lookups(cls) -> Dict[str, asyncio.Future]:
+        """Uncached lookups running on the current event loop, shared by every instance"""
+        loop = asyncio.get_running_loop()
+        inflight = cls._inflight.get(loop)
+        if inflight is None:
+            inflight = cls._inflight[loop] = {}
+        return inflight
+    
+    @staticmethod
+    def _settle_inflight(inflight: Dict[str, asyncio.Future], owned: Dict[str, asyncio.Future],
+                         locations: Dict[str, Optional[Dict[str, Any]]]):
+        """Hand resolved locations to the waiters of the lookups this caller owns"""
+        for ip, location in locations.items():
+            future = owned.get(ip)
+            if future is not None and not future.done():
+                future.set_result(location)
+            if inflight.get(ip) is future:
+                del inflight[ip]
+    
+    async def _resolve_coalesced(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Share one uncached resolution between concurrent callers asking for the same IP"""
+        inflight = self._inflight_lookups()
+        future = inflight.get(ip_address)
+        if future is not None:
+            # Shield so a cancelled waiter does not cancel the lookup others depend on
+            return await asyncio.shield(future)
+        
+        future = asyncio.get_running_loop().create_future()
+        owned = {ip_address: future}
+        inflight[ip_address] = future
+        location = None
+        try:
+            location = await self._resolve_uncached_location(ip_address)
+            return location
+        finally:
+            # If the owner was cancelled, waiters get no location rather than the cancellation
+            self._settle_inflight(inflight, owned, {ip_address: location})
+    
+    async def _resolve_uncached_location(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Resolve an IP missing from cache and local database: API, then cloud/unknown fallback"""
+        try:
+            # Query API (as a fallback), otherwise fall back on cloud/unknown information
+            location_data = await self._query_api_location(ip_address) or self._fallback_location(ip_address)
+            
+            # Store to cache
+            await self._cache_location(ip_address, location_data)
+            return location_data
+            
+        except Exception as e:
+            logger.error(f"Error resolving location for IP {ip_address}: {e}")
+            return None
+    
+    def _fallback_location(self, ip_address: str) -> Dict[str, Any]:
+        """Fallback information when no provider could locate the IP"""
+        # Fallback information based on cloud service provider
+        cloud_provider = self._identify_cloud_provider(ip_address)
+        if cloud_provider:
+            return _cloud_location(ip_address, cloud_provider)
+        
+        # Final fallback
+        return {'ip': ip_address, **_UNKNOWN_LOCATION}
+    
+    def _memory_cache_get(self, ip_address: str) -> Optional[Dict[str, Any]]:
+        """Return an unexpired in-memory entry, refreshing its LRU position"""
+        stats = IPGeolocationService._memory_cache_stats
+        entry = self._memory_cache.get(ip_address)
+        if entry is None:
+            stats['misses'] += 1
+            return None
+        # Tolerate concurrent eviction: the cache is shared with services on other threads
+        if entry[0] < time.monotonic():
+            self._memory_cache.pop(ip_address, None)
+            stats['misses'] += 1
+            return None
+        try:
+            self._memory_cache.move_to_end(ip_address)
+        except KeyError:
+            pass
+        stats['hits'] += 1
+        self._record_access(ip_address)
+        return entry[1]
+    
+    def _record_access(self, ip_address: str):
+        """Count an access; all counts are halved every 10x memory_cache_size accesses"""
+        cls = IPGeolocationService
+        cls._access_counts[ip_address] += 1
+        cls._access_total += 1
+        if cls._access_total >= 10 * self.memory_cache_size:
+            cls._access_counts = Counter({
+                ip: count // 2 for ip, count in cls._access_counts.items() if count > 1
+            })
+            cls._access_total = 0
+    
+    def _memory_cache_put(self, ip_address: str, location: Dict[str, Any]):
+        """Store a resolved location, evicting the least recently used entries"""
+        # Repeated provider/country strings are swapped for one pooled object before caching
+        pool = self._str_pool
+        if len(pool) >= self.str_pool_size:
+            pool.clear()
+        for field in _POOLED_FIELDS:
+            value = location.get(field)
+            if isinstance(value, str):
+                location[field] = pool.setdefault(value, value)
+        cache = self._memory_cache
+        self._record_access(ip_address)
+        if ip_address not in cache and len(cache) >= self.memory_cache_size and cache:
+            # Admit only if the newcomer is used at least as often as the entry it would evict
+            counts = IPGeolocationService._access_counts
+            try:
+                victim = next(iter(cache))
+            except (StopIteration, RuntimeError):
+                victim = None
+            if victim is not None and counts[ip_address] < counts[victim]:
+                IPGeolocationService._memory_cache_stats['rejected'] += 1
+                return
+        cache.pop(ip_address, None)
+        cache[ip_address] = (time.monotonic() + self.memory_cache_ttl, location)
+        try:
+            while len(cache) > self.memory_cache_size:
+                cache.popitem(last=False)
+        except KeyError:
+            pass
+    
+    @classmethod
+    def memory_cache_stats(cls) -> Dict[str, Any]:
+        """Hit/miss/rejection counters of the in-process location cache"""
+        stats = dict(cls._memory_cache_stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['size'] = len(cls._shared_memory_cache)
+        stats['hit_ratio'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    @classmethod
+    def evict_memory_cache(cls, ip_addresses: List[str]):
+        """Drop in-process entries so the next lookup goes back to the database"""
+        for ip_address in ip_addresses:
+            cls._shared_memory_cache.pop(ip_address, None)
+    
+    def _cache_cutoff(self) -> datetime:
+        """Oldest last_updated still considered fresh, recomputed at most every 5 seconds"""
+        stamp, cutoff = self._cutoff_cache
+        now = time.monotonic()
+        if cutoff is None or now - stamp > 5.0:
+            cutoff = datetime.now(timezone.utc) - timedelta(hours=self.cache_duration_hours)
+            self._cutoff_cache = (now, cutoff)
+        return cutoff
+    
     async def _get_cached_location(self, ip_address: str) -> Optional[Dict[str, Any]]:
         """Get geolocation information from cache"""
         try:
+            # Rows past the cache duration are still served; they are refreshed in the background
             query = """
             SELECT country_code, country_name, region, city, latitude, longitude, 
-                   isp, organization, last_updated
+                   isp, organization, last_updated, last_updated <= $2 AS stale
             FROM ip_geolocation_cache 
             WHERE ip_address = $1 
-            AND last_updated > $2
             """
             
-            cutoff_time = datetime.now() - timedelta(hours=self.cache_duration_hours)
+            cutoff_time = self._cache_cutoff()
             result = await self.db_manager.execute_query(query, (ip_address, cutoff_time))
             
             if result:
                 location = result[0]
+                if location['stale']:
+                    self._schedule_stale_refresh([ip_address])
                 return {
                     'ip': ip_address,
                     'country': location['country_name'],
@@ -195,7 +1148,8 @@ class IPGeolocationService:
                     'lon': float(location['longitude']) if location['longitude'] else None,
                     'isp': location['isp'],
                     'org': location['organization'],
-                    'cached': True
+                    'cached': True,
+                    'stale': location['stale']
                 }
             
             return None
@@ -212,23 +1166,7 @@ class IPGeolocationService:
             result = await self.db_manager.execute_query(query, (ip_address,))
             
             if result and result[0]['country_code']:
-                location = result[0]
-                
-                # Convert to standard format
-                return {
-                    'ip': ip_address,
-                    'country': location['country_name'] or 'Unknown',
-                    'countryCode': location['country_code'] or 'UN',
-                    'region': 'Unknown',  # Local database does not contain region information
-                    'city': 'Unknown',    # Local database does not contain city information
-                    'lat': None,
-                    'lon': None,
-                    'isp': location['asn_name'] or 'Unknown',
-                    'org': location['asn_name'] or 'Unknown',
-                    'asn': location['asn'],
-                    'cached': False,
-                    'source': 'local_reference_db'
-                }
+                return self._format_local_reference_row(ip_address, result[0])
             
             return None
             
@@ -236,44 +1174,135 @@ class IPGeolocationService:
             logger.warning(f"Error querying local reference database for {ip_address}: {e}")
             return None
     
+    async def _batch_query_local_reference_db(self, ip_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Query local reference database for many IPs in a single round trip"""
+        if not ip_addresses:
+            return {}
+        
+        try:
+            query = """
+            SELECT host(x.ip) AS ip_address, l.*
+            FROM unnest($1::inet[]) AS x(ip),
+                 LATERAL lookup_ip_location(x.ip) AS l
+            WHERE l.country_code IS NOT NULL
+            """
+            result = await self.db_manager.execute_query(query, (ip_addresses,))
+            
+            return {
+                row['ip_address']: self._format_local_reference_row(row['ip_address'], row)
+                for row in result
+            }
+            
+        except Exception as e:
+            logger.warning(f"Error batch querying local reference database: {e}")
+            return {}
+    
+    def _format_local_reference_row(self, ip_address: str, location: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a lookup_ip_location row to standard format"""
+        return {
+            'ip': ip_address,
+            'country': location['country_name'] or 'Unknown',
+            'countryCode': location['country_code'] or 'UN',
+            'region': 'Unknown',  # Local database does not contain region information
+            'city': 'Unknown',    # Local database does not contain city information
+            'lat': None,
+            'lon': None,
+            'isp': location['asn_name'] or 'Unknown',
+            'org': location['asn_name'] or 'Unknown',
+            'asn': location['asn'],
+            'cached': False,
+            'source': 'local_reference_db'
+        }
+    
+    def _select_provider(self) -> Optional[str]:
+        """First provider (in preference order) not on cooldown; None if all are cooling down"""
+        now = time.monotonic()
+        for name in self.providers:
+            if IPGeolocationService._provider_cooldown.get(name, 0.0) <= now:
+                if name != self.current_provider:
+                    logger.warning(f"Switching geolocation provider {self.current_provider} -> {name}")
+                    self.current_provider = name
+                return name
+        return None
+    
+    def _api_concurrency(self, provider: str) -> int:
+        """Full fan-out normally; a narrow one while the provider has recently answered 429"""
+        throttled_at = IPGeolocationService._throttled_at.get(provider)
+        if throttled_at is not None and time.monotonic() - throttled_at < self.throttle_window:
+            return self.throttled_api_concurrency
+        return self.api_concurrency
+    
+    def _record_provider_failure(self, provider: str, cooldown: Optional[float] = None):
+        """Count a transient failure; cool the provider down once the threshold is reached"""
+        cls = IPGeolocationService
+        failures = cls._provider_failures.get(provider, 0) + 1
+        if cooldown is None and failures < self.provider_failure_threshold:
+            cls._provider_failures[provider] = failures
+            return
+        cls._provider_failures[provider] = 0
+        cls._provider_cooldown[provider] = time.monotonic() + (
+            cooldown if cooldown is not None else self.provider_cooldown_seconds
+        )
+    
     async def _query_api_location(self, ip_address: str) -> Optional[Dict[str, Any]]:
         """Query API for geolocation information, add retry and error handling"""
         max_retries = 3
         retry_delay = 1.0
         
         for attempt in range(max_retries):
+            provider = self._select_provider()
+            if provider is None:
+                logger.warning(f"All geolocation providers are cooling down, skipping IP {ip_address}")
+                return None
+            # Jittered exponential backoff for transient errors
+            backoff = min(30.0, retry_delay * (2 ** attempt)) * random.uniform(0.5, 1.5)
+            
             try:
-                # Check rate limit
-                if not self._check_rate_limit():
-                    logger.warning(f"Rate limit exceeded for provider {self.current_provider}")
-                    await asyncio.sleep(retry_delay)
+                # Wait for a rate limit token; an exhausted provider is failed over
+                rate_limiter = self._rate_limiters[provider]
+                if not await rate_limiter.acquire(max_wait=retry_delay * max_retries):
+                    logger.warning(f"Rate limit exceeded for provider {provider}")
+                    self._record_provider_failure(provider, cooldown=self.provider_cooldown_seconds)
                     continue
                 
                 session = await self.get_session()
-                provider_config = self.providers[self.current_provider]
+                provider_config = self.providers[provider]
                 url = provider_config['url'].format(ip=ip_address)
                 
-                if self.current_provider == 'ip-api' and provider_config['fields']:
+                if provider == 'ip-api' and provider_config['fields']:
                     url += f"?fields={provider_config['fields']}"
                 
                 async with session.get(url) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        result = self._parse_provider_response(data, ip_address)
+                        data = _json_loads(await response.read())
+                        IPGeolocationService._provider_failures[provider] = 0
+                        result = self._parse_provider_response(data, ip_address, provider)
                         if result:
                             return result
                     elif response.status == 429:  # Rate limit
-                        logger.warning(f"Rate limit hit for {self.current_provider}, attempt {attempt + 1}")
-                        await asyncio.sleep(retry_delay * (2 ** attempt))
+                        logger.warning(f"Rate limit hit for {provider}, attempt {attempt + 1}")
+                        IPGeolocationService._throttled_at[provider] = time.monotonic()
+                        reset_after = self._parse_rate_limit_reset(response.headers)
+                        if reset_after is not None:
+                            rate_limiter.penalize(reset_after)
+                            self._record_provider_failure(provider, cooldown=reset_after)
+                        else:
+                            self._record_provider_failure(provider)
+                            await asyncio.sleep(backoff)
                     else:
                         logger.warning(f"API request failed with status {response.status}")
+                        self._record_provider_failure(provider)
+                        if response.status >= 500:
+                            await asyncio.sleep(backoff)
                         
             except asyncio.TimeoutError:
-                logger.warning(f"Timeout querying {self.current_provider} for IP {ip_address}, attempt {attempt + 1}")
-                await asyncio.sleep(retry_delay)
+                logger.warning(f"Timeout querying {provider} for IP {ip_address}, attempt {attempt + 1}")
+                self._record_provider_failure(provider)
+                await asyncio.sleep(backoff)
             except Exception as e:
                 logger.error(f"Error querying API for IP {ip_address}, attempt {attempt + 1}: {e}")
-                await asyncio.sleep(retry_delay)
+                self._record_provider_failure(provider)
+                await asyncio.sleep(backoff)
         
         return None
     
@@ -282,541 +1311,484 @@ class IPGeolocationService:
         if not country_name:
             return 'Unknown'
         
-        # Comprehensive standardization mapping
-        standardization_map = {
-            # English-speaking countries
-            'united states': 'United States',
-            'usa': 'United States', 
-            'united states of america': 'United States',
-            'us': 'United States',
-            'united kingdom': 'United Kingdom',
-            'uk': 'United Kingdom',
-            'great britain': 'United Kingdom',
-            'england': 'United Kingdom',
-            'scotland': 'United Kingdom',
-            'wales': 'United Kingdom',
-            'northern ireland': 'United Kingdom',
-            'australia': 'Australia',
-            'canada': 'Canada',
-            'new zealand': 'New Zealand',
-            'ireland': 'Ireland',
-            'republic of ireland': 'Ireland',
-            'south africa': 'South Africa',
-            
-            # European countries
-            'the netherlands': 'Netherlands',
-            'netherlands': 'Netherlands',
-            'holland': 'Netherlands',
-            'germany': 'Germany',
-            'deutschland': 'Germany',
-            'france': 'France',
-            'italia': 'Italy',
-            'italy': 'Italy',
-            'spain': 'Spain',
-            'espana': 'Spain',
-            'españa': 'Spain',
-            'portugal': 'Portugal',
-            'switzerland': 'Switzerland',
-            'austria': 'Austria',
-            'belgium': 'Belgium',
-            'luxembourg': 'Luxembourg',
-            'denmark': 'Denmark',
-            'sweden': 'Sweden',
-            'norway': 'Norway',
-            'finland': 'Finland',
-            'poland': 'Poland',
-            'czech republic': 'Czech Republic',
-            'czechia': 'Czech Republic',
-            'slovakia': 'Slovakia',
-            'hungary': 'Hungary',
-            'slovenia': 'Slovenia',
-            'croatia': 'Croatia',
-            'bosnia and herzegovina': 'Bosnia and Herzegovina',
-            'serbia': 'Serbia',
-            'montenegro': 'Montenegro',
-            'macedonia': 'North Macedonia',
-            'north macedonia': 'North Macedonia',
-            'albania': 'Albania',
-            'greece': 'Greece',
-            'bulgaria': 'Bulgaria',
-            'romania': 'Romania',
-            'lithuania': 'Lithuania',
-            'latvia': 'Latvia',
-            'estonia': 'Estonia',
-            'belarus': 'Belarus',
-            'ukraine': 'Ukraine',
-            'moldova': 'Moldova',
-            'moldova, republic of': 'Moldova',
-            'russian federation': 'Russia',
-            'russia': 'Russia',
-            
-            # Asian countries
-            'china': 'China',
-            'people\'s republic of china': 'China',
-            'prc': 'China',
-            'japan': 'Japan',
-            'south korea': 'South Korea',
-            'korea, republic of': 'South Korea',
-            'republic of korea': 'South Korea',
-            'north korea': 'North Korea',
-            'korea, democratic people\'s republic of': 'North Korea',
-            'democratic people\'s republic of korea': 'North Korea',
-            'india': 'India',
-            'pakistan': 'Pakistan',
-            'bangladesh': 'Bangladesh',
-            'sri lanka': 'Sri Lanka',
-            'myanmar': 'Myanmar',
-            'burma': 'Myanmar',
-            'thailand': 'Thailand',
-            'vietnam': 'Vietnam',
-            'viet nam': 'Vietnam',
-            'cambodia': 'Cambodia',
-            'laos': 'Laos',
-            'singapore': 'Singapore',
-            'malaysia': 'Malaysia',
-            'indonesia': 'Indonesia',
-            'philippines': 'Philippines',
-            'brunei': 'Brunei',
-            'taiwan': 'Taiwan',
-            'taiwan, province of china': 'Taiwan',
-            'hong kong': 'Hong Kong',
-            'hong kong sar china': 'Hong Kong',
-            'macau': 'Macao',
-            'macao': 'Macao',
-            'macao sar china': 'Macao',
-            
-            # Middle Eastern countries
-            'iran': 'Iran',
-            'iran, islamic republic of': 'Iran',
-            'islamic republic of iran': 'Iran',
-            'iraq': 'Iraq',
-            'afghanistan': 'Afghanistan',
-            'turkey': 'Turkey',
-            'syria': 'Syria',
-            'syrian arab republic': 'Syria',
-            'lebanon': 'Lebanon',
-            'jordan': 'Jordan',
-            'israel': 'Israel',
-            'palestine': 'Palestine',
-            'palestine, state of': 'Palestine',
-            'state of palestine': 'Palestine',
-            'saudi arabia': 'Saudi Arabia',
-            'united arab emirates': 'United Arab Emirates',
-            'uae': 'United Arab Emirates',
-            'qatar': 'Qatar',
-            'kuwait': 'Kuwait',
-            'bahrain': 'Bahrain',
-            'oman': 'Oman',
-            'yemen': 'Yemen',
-            
-            # African countries
-            'egypt': 'Egypt',
-            'libya': 'Libya',
-            'tunisia': 'Tunisia',
-            'algeria': 'Algeria',
-            'morocco': 'Morocco',
-            'sudan': 'Sudan',
-            'ethiopia': 'Ethiopia',
-            'kenya': 'Kenya',
-            'uganda': 'Uganda',
-            'tanzania': 'Tanzania',
-            'tanzania, united republic of': 'Tanzania',
-            'united republic of tanzania': 'Tanzania',
-            'zimbabwe': 'Zimbabwe',
-            'zambia': 'Zambia',
-            'botswana': 'Botswana',
-            'namibia': 'Namibia',
-            'ghana': 'Ghana',
-            'nigeria': 'Nigeria',
-            'senegal': 'Senegal',
-            'mali': 'Mali',
-            'burkina faso': 'Burkina Faso',
-            'ivory coast': 'Ivory Coast',
-            'cote d\'ivoire': 'Ivory Coast',
-            'cameroon': 'Cameroon',
-            'chad': 'Chad',
-            'central african republic': 'Central African Republic',
-            'democratic republic of the congo': 'Democratic Republic of the Congo',
-            'republic of the congo': 'Republic of the Congo',
-            'gabon': 'Gabon',
-            'equatorial guinea': 'Equatorial Guinea',
-            'madagascar': 'Madagascar',
-            
-            # South American countries
-            'brazil': 'Brazil',
-            'argentina': 'Argentina',
-            'chile': 'Chile',
-            'peru': 'Peru',
-            'colombia': 'Colombia',
-            'venezuela': 'Venezuela',
-            'venezuela, bolivarian republic of': 'Venezuela',
-            'bolivarian republic of venezuela': 'Venezuela',
-            'ecuador': 'Ecuador',
-            'bolivia': 'Bolivia',
-            'bolivia, plurinational state of': 'Bolivia',
-            'plurinational state of bolivia': 'Bolivia',
-            'paraguay': 'Paraguay',
-            'uruguay': 'Uruguay',
-            'guyana': 'Guyana',
-            'suriname': 'Suriname',
-            'french guiana': 'French Guiana',
-            
-            # Special territories and city-states
-            'vatican': 'Vatican City',
-            'vatican city': 'Vatican City',
-            'holy see (vatican city state)': 'Vatican City',
-            'holy see': 'Vatican City',
-            'monaco': 'Monaco',
-            'san marino': 'San Marino',
-            'liechtenstein': 'Liechtenstein',
-            'andorra': 'Andorra',
-            'gibraltar': 'Gibraltar',
-            'bermuda': 'Bermuda',
-            'puerto rico': 'Puerto Rico',
-            'guam': 'Guam',
-            'virgin islands': 'Virgin Islands',
-            'cayman islands': 'Cayman Islands',
-            'bahamas': 'Bahamas',
-            'barbados': 'Barbados',
-            'jamaica': 'Jamaica',
-            'trinidad and tobago': 'Trinidad and Tobago',
-            'martinique': 'Martinique',
-            'guadeloupe': 'Guadeloupe',
-            'aruba': 'Aruba',
-            'netherlands antilles': 'Netherlands Antilles',
-            'curacao': 'Curacao',
-            'curaçao': 'Curacao',
-            'saint lucia': 'Saint Lucia',
-            'grenada': 'Grenada',
-            'dominica': 'Dominica',
-            'antigua and barbuda': 'Antigua and Barbuda',
-            'saint kitts and nevis': 'Saint Kitts and Nevis',
-            'saint vincent and the grenadines': 'Saint Vincent and the Grenadines',
-            'dominican republic': 'Dominican Republic',
-            'haiti': 'Haiti',
-            'cuba': 'Cuba',
-            
-            # Pacific region
-            'fiji': 'Fiji',
-            'papua new guinea': 'Papua New Guinea',
-            'solomon islands': 'Solomon Islands',
-            'vanuatu': 'Vanuatu',
-            'new caledonia': 'New Caledonia',
-            'french polynesia': 'French Polynesia',
-            'samoa': 'Samoa',
-            'tonga': 'Tonga',
-            'palau': 'Palau',
-            'micronesia': 'Micronesia',
-            'marshall islands': 'Marshall Islands',
-            'kiribati': 'Kiribati',
-            'tuvalu': 'Tuvalu',
-            'nauru': 'Nauru',
-            'cook islands': 'Cook Islands',
-            'niue': 'Niue',
-            'tokelau': 'Tokelau',
-            'american samoa': 'American Samoa',
-            'northern mariana islands': 'Northern Mariana Islands',
-            
-            # Other regions
-            'greenland': 'Greenland',
-            'iceland': 'Iceland',
-            'faroe islands': 'Faroe Islands',
-            'åland islands': 'Åland Islands',
-            'aland islands': 'Åland Islands',
-            'svalbard and jan mayen': 'Svalbard and Jan Mayen',
-            'isle of man': 'Isle of Man',
-            'jersey': 'Jersey',
-            'guernsey': 'Guernsey',
-            'falkland islands': 'Falkland Islands',
-            'south georgia and the south sandwich islands': 'South Georgia and the South Sandwich Islands',
-            'british indian ocean territory': 'British Indian Ocean Territory',
-            'christmas island': 'Christmas Island',
-            'cocos islands': 'Cocos Islands',
-            'norfolk island': 'Norfolk Island',
-            'heard island and mcdonald islands': 'Heard Island and McDonald Islands',
-            'antarctica': 'Antarctica',
-            'bouvet island': 'Bouvet Island',
-            'french southern territories': 'French Southern Territories',
-            'mayotte': 'Mayotte',
-            'reunion': 'Reunion',
-            'réunion': 'Reunion',
-            'saint helena': 'Saint Helena',
-            'ascension and tristan da cunha': 'Ascension and Tristan da Cunha',
-            'western sahara': 'Western Sahara',
-            'pitcairn': 'Pitcairn',
-            'turks and caicos islands': 'Turks and Caicos Islands',
-            'british virgin islands': 'British Virgin Islands',
-            'anguilla': 'Anguilla',
-            'montserrat': 'Montserrat',
-            'saint pierre and miquelon': 'Saint Pierre and Miquelon',
-            'wallis and futuna': 'Wallis and Futuna',
-            'saint martin': 'Saint Martin',
-            'sint maarten': 'Sint Maarten',
-            'saint barthelemy': 'Saint Barthelemy',
-            'saint barthélemy': 'Saint Barthelemy'
-        }
-        
-        # Convert to lowercase for matching
-        country_lower = country_name.lower().strip()
-        
-        # If found in standardization map, return standardized name
-        if country_lower in standardization_map:
-            return standardization_map[country_lower]
-        
-        # Otherwise return original name (first letter capitalized)
-        return country_name.title()
+        # The same few countries dominate bulk lookups, so results are memoized
+        return _standardize_country_cached(country_name)
     
-    def _parse_provider_response(self, data: Dict[str, Any], ip_address: str) -> Optional[Dict[str, Any]]:
+    def _parse_provider_response(self, data: Dict[str, Any], ip_address: str,
+                                 provider: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Parse response format from different API providers"""
-        try:
-            if self.current_provider == 'ip-api':
-                if data.get('status') == 'success':
-                    raw_country = data.get('country', 'Unknown')
-                    standardized_country = self._standardize_country_name(raw_country)
-                    return {
-                        'ip': ip_address,
-                        'country': standardized_country,
-                        'countryCode': data.get('countryCode', 'UN'),
-                        'region': data.get('regionName', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'lat': data.get('lat'),
-                        'lon': data.get('lon'),
-                        'isp': data.get('isp', 'Unknown'),
-                        'org': data.get('org', 'Unknown'),
-                        'cached': False
-                    }
-                else:
-                    logger.warning(f"API returned error for {ip_address}: {data.get('message', 'Unknown error')}")
-                    return None
-            
-            elif self.current_provider == 'ipapi':
-                if 'error' not in data:
-                    raw_country = data.get('country_name', 'Unknown')
-                    standardized_country = self._standardize_country_name(raw_country)
-                    return {
-                        'ip': ip_address,
-                        'country': standardized_country,
-                        'countryCode': data.get('country', 'UN'),
-                        'region': data.get('region', 'Unknown'),
-                        'city': data.get('city', 'Unknown'),
-                        'lat': data.get('latitude'),
-                        'lon': data.get('longitude'),
-                        'isp': data.get('org', 'Unknown'),
-                        'org': data.get('org', 'Unknown'),
-                        'cached': False
-                    }
-            
-            elif self.current_provider == 'freegeoip':
-                raw_country = data.get('country_name', 'Unknown')
-                standardized_country = self._standardize_country_name(raw_country)
-                return {
-                    'ip': ip_address,
-                    'country': standardized_country,
-                    'countryCode': data.get('country_code', 'UN'),
-                    'region': data.get('region_name', 'Unknown'),
-                    'city': data.get('city', 'Unknown'),
-                    'lat': data.get('latitude'),
-                    'lon': data.get('longitude'),
-                    'isp': 'Unknown',
-                    'org': 'Unknown',
-                    'cached': False
-                }
-            
+        parser = self._parsers.get(provider or self.current_provider)
+        if parser is None:
             return None
-            
+        try:
+            return parser(data, ip_address)
         except Exception as e:
             logger.error(f"Error parsing provider response: {e}")
             return None
     
+    def _parse_ip_api(self, data: Dict[str, Any], ip_address: str) -> Optional[Dict[str, Any]]:
+        """Parse an ip-api.com response"""
+        get = data.get
+        if get('status') != 'success':
+            logger.warning(f"API returned error for {ip_address}: {get('message', 'Unknown error')}")
+            return None
+        return {
+            'ip': ip_address,
+            'country': self._standardize_country_name(get('country', 'Unknown')),
+            'countryCode': get('countryCode', 'UN'),
+            'region': get('regionName', 'Unknown'),
+            'city': get('city', 'Unknown'),
+            'lat': get('lat'),
+            'lon': get('lon'),
+            'isp': get('isp', 'Unknown'),
+            'org': get('org', 'Unknown'),
+            'cached': False
+        }
+    
+    def _parse_ipapi(self, data: Dict[str, Any], ip_address: str) -> Optional[Dict[str, Any]]:
+        """Parse an ipapi.co response"""
+        if 'error' in data:
+            return None
+        get = data.get
+        org = get('org', 'Unknown')
+        return {
+            'ip': ip_address,
+            'country': self._standardize_country_name(get('country_name', 'Unknown')),
+            'countryCode': get('country', 'UN'),
+            'region': get('region', 'Unknown'),
+            'city': get('city', 'Unknown'),
+            'lat': get('latitude'),
+            'lon': get('longitude'),
+            'isp': org,
+            'org': org,
+            'cached': False
+        }
+    
+    def _parse_freegeoip(self, data: Dict[str, Any], ip_address: str) -> Optional[Dict[str, Any]]:
+        """Parse a freegeoip.app response"""
+        get = data.get
+        return {
+            'ip': ip_address,
+            'country': self._standardize_country_name(get('country_name', 'Unknown')),
+            'countryCode': get('country_code', 'UN'),
+            'region': get('region_name', 'Unknown'),
+            'city': get('city', 'Unknown'),
+            'lat': get('latitude'),
+            'lon': get('longitude'),
+            'isp': 'Unknown',
+            'org': 'Unknown',
+            'cached': False
+        }
+    
     async def _cache_location(self, ip_address: str, location_data: Dict[str, Any]):
-        """Cache geolocation information to database"""
+        """Queue geolocation information for the database; the caller does not wait for the write"""
+        cls = IPGeolocationService
+        cls._pending_cache_writes[ip_address] = location_data
+        loop = asyncio.get_running_loop()
+        task = cls._cache_flush_task
+        # A task left on another (closed) event loop will never finish; replace it
+        if task is None or task.done() or task.get_loop() is not loop:
+            cls._cache_flush_task = loop.create_task(self._flush_cache_writes())
+    
+    async def _flush_cache_writes(self):
+        """Write the queued single-IP locations in one upsert per write window until the queue is empty"""
+        cls = IPGeolocationService
+        while cls._pending_cache_writes:
+            await asyncio.sleep(self.cache_write_window)
+            pending, cls._pending_cache_writes = cls._pending_cache_writes, {}
+            await self._cache_locations_bulk(pending)
+    
+    async def _cache_locations_bulk(self, locations: Dict[str, Dict[str, Any]]):
+        """Cache many geolocation records with a single multi-row upsert"""
+        if not locations:
+            return
+        
         try:
-            query = """
-            INSERT INTO ip_geolocation_cache 
-            (ip_address, country_code, country_name, region, city, latitude, longitude, isp, organization)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            ON CONFLICT (ip_address) 
-            DO UPDATE SET
-                country_code = EXCLUDED.country_code,
-                country_name = EXCLUDED.country_name,
-                region = EXCLUDED.region,
-                city = EXCLUDED.city,
-                latitude = EXCLUDED.latitude,
-                longitude = EXCLUDED.longitude,
-                isp = EXCLUDED.isp,
-                organization = EXCLUDED.organization,
-                last_updated = CURRENT_TIMESTAMP
-            """
+            records = locations.values()
+            columns = (
+                list(locations.keys()),
+                [data.get('countryCode', 'UN') for data in records],
+                [data.get('country', 'Unknown') for data in records],
+                [data.get('region', 'Unknown') for data in records],
+                [data.get('city', 'Unknown') for data in records],
+                [data.get('lat') for data in records],
+                [data.get('lon') for data in records],
+                [data.get('isp', 'Unknown') for data in records],
+                [data.get('org', 'Unknown') for data in records]
+            )
             
-            await self.db_manager.execute_command(query, (
-                ip_address,
-                location_data.get('countryCode', 'UN'),
-                location_data.get('country', 'Unknown'),
-                location_data.get('region', 'Unknown'),
-                location_data.get('city', 'Unknown'),
-                location_data.get('lat'),
-                location_data.get('lon'),
-                location_data.get('isp', 'Unknown'),
-                location_data.get('org', 'Unknown')
-            ))
+            if len(locations) >= self.bulk_copy_threshold:
+                # Large bursts: binary COPY into a staging table, then one merge
+                await self.db_manager.bulk_upsert(
+                    'ip_geolocation_cache', list(_CACHE_COLUMNS), list(zip(*columns)), _CACHE_CONFLICT_CLAUSE
+                )
+            else:
+                query = f"""
+                INSERT INTO ip_geolocation_cache 
+                ({', '.join(_CACHE_COLUMNS)})
+                SELECT * FROM unnest(
+                    $1::inet[], $2::text[], $3::text[], $4::text[], $5::text[],
+                    $6::float8[], $7::float8[], $8::text[], $9::text[]
+                )
+                {_CACHE_CONFLICT_CLAUSE}
+                """
+                await self.db_manager.execute_command(query, columns)
             
-            logger.debug(f"Cached location data for IP {ip_address}")
+            logger.debug(f"Cached location data for {len(locations)} IPs")
             
         except Exception as e:
-            logger.error(f"Error caching location for IP {ip_address}: {e}")
+            logger.error(f"Error bulk caching locations for {len(locations)} IPs: {e}")
     
-    def _check_rate_limit(self) -> bool:
-        """Check API call rate limit"""
-        current_time = time.time()
-        
-        # Reset counter (per minute)
-        if current_time - self.last_reset_time > 60:
-            self.request_count = 0
-            self.last_reset_time = current_time
+    def _supports_batch(self, provider: str) -> bool:
+        """Whether the provider has a batch endpoint and a rate limit for it"""
+        provider_config = self.providers[provider]
+        return bool(provider_config.get('batch_url')) and 'batch_rate_limit' in provider_config
+    
+    async def _query_api_location_batch(self, ip_addresses: List[str],
+                                        provider: str) -> Dict[str, Dict[str, Any]]:
+        """Query up to batch_size IPs in one request to the given provider's batch endpoint"""
+        provider_config = self.providers[provider]
+        rate_limiter = self._batch_rate_limiters[provider]
         
-        provider_config = self.providers[self.current_provider]
-        rate_limit = provider_config['rate_limit']
+        if not await rate_limiter.acquire(max_wait=3.0):
+            logger.warning(f"Batch rate limit exceeded for provider {provider}")
+            return {}
         
-        if self.request_count >= rate_limit:
-            return False
+        try:
+            session = await self.get_session()
+            url = provider_config['batch_url']
+            if provider_config['fields']:
+                url += f"?fields={provider_config['fields']}"
+            
+            async with session.post(url, json=ip_addresses) as response:
+                if response.status == 429:
+                    logger.warning(f"Batch rate limit hit for {provider}")
+                    IPGeolocationService._throttled_at[provider] = time.monotonic()
+                    reset_after = self._parse_rate_limit_reset(response.headers)
+                    if reset_after is not None:
+                        rate_limiter.penalize(reset_after)
+                    return {}
+                if response.status != 200:
+                    logger.warning(f"Batch API request failed with status {response.status}")
+                    return {}
+                data = _json_loads(await response.read())
+                
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout querying {provider} batch of {len(ip_addresses)} IPs")
+            return {}
+        except Exception as e:
+            logger.error(f"Error querying batch API for {len(ip_addresses)} IPs: {e}")
+            return {}
         
-        self.request_count += 1
-        return True
+        # Responses come back in request order
+        results = {}
+        for ip_address, item in zip(ip_addresses, data):
+            location = self._parse_provider_response(item, ip_address, provider)
+            if location:
+                results[ip_address] = location
+        return results
+    
+    def _parse_rate_limit_reset(self, headers) -> Optional[float]:
+        """Seconds until the provider quota resets, from Retry-After or ip-api's X-Ttl header"""
+        for header in ('Retry-After', 'X-Ttl'):
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    return max(0.0, float(value))
+                except ValueError:
+                    continue
+        return None
     
     async def bulk_get_locations(self, ip_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
         """Bulk get geolocation information for multiple IP addresses, optimize performance"""
+        return {ip: location async for ip, location in self.iter_locations(ip_addresses)}
+    
+    async def iter_locations(self, ip_addresses: List[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (ip, location) pairs for multiple IP addresses as each stage resolves them,
+        so large lookups can be consumed without holding every result at once
+        """
         if not ip_addresses:
-            return {}
+            return
         
-        results = {}
+        self._schedule_cloud_range_refresh()
+        # IPs grouped by classification outcome, so each group is yielded by a branch-free loop
+        private_ips = []
+        dns_ips = []
+        cloud_ips = []
+        memory_ips = []
+        lookup_ips = []
         
-        # Deduplicate and filter private IPs
+        # Fast processing of private IPs and known patterns (deduplicated)
         unique_ips = list(set(ip_addresses))
-        public_ips = []
-        
-        # Fast processing of private IPs and known patterns
-        for ip in unique_ips:
-            if self._is_private_ip(ip):
-                results[ip] = {
-                    'ip': ip,
-                    'country': 'Local Network',
-                    'countryCode': 'LN',
-                    'region': 'Private',
-                    'city': 'Local',
-                    'lat': None,
-                    'lon': None,
-                    'isp': 'Local Network',
-                    'org': 'Private Network',
-                    'cached': False,
-                    'source': 'local_detection'
-                }
-            elif ip in ['8.8.8.8', '8.8.4.4', '1.1.1.1', '1.0.0.1']:
-                # Fast processing of known DNS servers
-                results[ip] = {
-                    'ip': ip,
-                    'country': 'United States',
-                    'countryCode': 'US',
-                    'region': 'DNS Service',
-                    'city': 'DNS',
-                    'lat': None,
-                    'lon': None,
-                    'isp': 'DNS Provider',
-                    'org': 'Public DNS',
-                    'cached': False,
-                    'source': 'known_service'
-                }
+        # Parse once; private ranges and cloud providers are classified as whole arrays
+        ip_u32s = [_ipv4_to_u32(ip) for ip in unique_ips]
+        private_flags, cloud_providers = self._classify_ips(unique_ips, ip_u32s)
+        for ip, private, cloud_provider in zip(unique_ips, private_flags, cloud_providers):
+            if private:
+                private_ips.append(ip)
+            elif ip in _KNOWN_DNS_SERVERS:
+                dns_ips.append(ip)
+            elif cloud_provider:
+                cloud_ips.append((ip, cloud_provider))
+            elif ip in self._memory_cache:
+                memory_ips.append(ip)
             else:
-                # Check cloud service provider
-                cloud_provider = self._identify_cloud_provider(ip)
-                if cloud_provider:
-                    results[ip] = {
-                        'ip': ip,
-                        'country': 'Cloud Service',
-                        'countryCode': 'CS',
-                        'region': cloud_provider,
-                        'city': 'Cloud',
-                        'lat': None,
-                        'lon': None,
-                        'isp': cloud_provider,
-                        'org': f'{cloud_provider} Cloud',
-                        'cached': False,
-                        'source': 'cloud_detection'
-                    }
+                lookup_ips.append(ip)
+        IPGeolocationService._memory_cache_stats['misses'] += len(lookup_ips)
+        
+        # Start the cache read now so its round trip overlaps with yielding the
+        # locally resolved results below
+        cache_task = (
+            asyncio.ensure_future(self._batch_get_cached_locations(lookup_ips)) if lookup_ips else None
+        )
+        try:
+            for ip in private_ips:
+                yield ip, {'ip': ip, **_PRIVATE_LOCATION}
+            # Fast processing of known DNS servers
+            for ip in dns_ips:
+                yield ip, self._known_service_location(ip)
+            for ip, cloud_provider in cloud_ips:
+                yield ip, _cloud_location(ip, cloud_provider)
+            
+            # Serve hot IPs from memory; entries that expired meanwhile go to the cache read below
+            late_ips = []
+            for ip in memory_ips:
+                location = self._memory_cache_get(ip)
+                if location:
+                    yield ip, location
                 else:
-                    public_ips.append(ip)
+                    late_ips.append(ip)
+            
+            if cache_task is None and not late_ips:
+                return
+            
+            # Batch query cache - single round trip
+            cached_results = await cache_task if cache_task is not None else {}
+        finally:
+            # Consumer stopped early: do not leave the cache read running
+            if cache_task is not None:
+                cache_task.cancel()
         
-        if not public_ips:
-            return results
+        if late_ips:
+            cached_results.update(await self._batch_get_cached_locations(late_ips))
+            lookup_ips.extend(late_ips)
+        stale_ips = [ip for ip, location in cached_results.items() if location['stale']]
+        if stale_ips:
+            self._schedule_stale_refresh(stale_ips)
+        for ip, location in cached_results.items():
+            if not location['stale']:
+                self._memory_cache_put(ip, location)
+            yield ip, location
         
-        # Batch query cache - cache query
-        cached_results = await self._batch_get_cached_locations(public_ips)
-        results.update(cached_results)
+        # Batch query local reference database for cache misses
+        missing_ips = [ip for ip in lookup_ips if ip not in cached_results]
+        local_results = await self._batch_query_local_reference_db(missing_ips)
+        for ip, location in local_results.items():
+            self._memory_cache_put(ip, location)
+            yield ip, location
         
-        # Get IPs that need to query API
-        uncached_ips = [ip for ip in public_ips if ip not in results]
+        # Get IPs that need to query API; those another lookup is already querying are
+        # awaited instead of queried again
+        uncached_ips = [ip for ip in missing_ips if ip not in local_results]
+        inflight = self._inflight_lookups()
+        joined = {ip: inflight[ip] for ip in uncached_ips if ip in inflight}
+        if len(joined) < len(uncached_ips):
+            async for item in self._iter_api_locations([ip for ip in uncached_ips if ip not in joined]):
+                yield item
+        for ip, future in joined.items():
+            # Shield so a consumer stopping early does not cancel the lookup others depend on
+            location = await asyncio.shield(future)
+            yield ip, location or self._fallback_location(ip)
+    
+    async def _iter_api_locations(self, uncached_ips: List[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (ip, location) pairs for IPs missing from every cache, querying the provider when
+        there are few enough; each IP is registered as in flight until its location is known
+        """
+        # Pin the provider for this lookup so a failover mid-flight cannot mix configurations
+        provider = self.current_provider
+        provider_config = self.providers[provider]
+        use_batch = self._supports_batch(provider)
+        # Only query API when there are few IPs; batch providers answer batch_size IPs per request
+        if use_batch:
+            api_limit = provider_config['batch_size'] * self.max_api_batches
+        else:
+            api_limit = self.max_api_lookups
         
-        if uncached_ips and len(uncached_ips) <= 100:  # Only query API when there are few IPs
-            # Significantly optimized concurrent processing
-            semaphore = asyncio.Semaphore(15)  # Increase concurrency
-            
-            async def get_single_location(ip):
-                async with semaphore:
-                    location = await self.get_ip_location(ip)
-                    if location:
-                        results[ip] = location
-                    # Remove unnecessary delay
-            
-            # Larger batch
-            batch_size = 50
-            for i in range(0, len(uncached_ips), batch_size):
-                batch = uncached_ips[i:i+batch_size]
-                tasks = [get_single_location(ip) for ip in batch]
-                await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Reduce batch delay
-                if i + batch_size < len(uncached_ips):
-                    await asyncio.sleep(0.3)  # Reduce from 1 second to 0.3 seconds
+        if len(uncached_ips) <= api_limit:
+            # Register the IPs as in flight so concurrent lookups wait for these queries
+            inflight = self._inflight_lookups()
+            loop = asyncio.get_running_loop()
+            owned = {ip: loop.create_future() for ip in uncached_ips}
+            inflight.update(owned)
+            try:
+                if use_batch:
+                    # One request per batch_size IPs instead of one per IP; yield each batch as it lands
+                    batch_size = provider_config['batch_size']
+                    
+                    async def query_batch(batch):
+                        return batch, await self._query_api_location_batch(batch, provider)
+                    
+                    tasks = [
+                        asyncio.ensure_future(query_batch(uncached_ips[i:i + batch_size]))
+                        for i in range(0, len(uncached_ips), batch_size)
+                    ]
+                    try:
+                        for next_batch in asyncio.as_completed(tasks):
+                            batch, batch_results = await next_batch
+                            locations = await self._store_api_results(batch, batch_results)
+                            self._settle_inflight(inflight, owned, locations)
+                            for item in locations.items():
+                                yield item
+                    finally:
+                        # Consumer stopped early: do not leave batch requests running
+                        for task in tasks:
+                            task.cancel()
+                else:
+                    # Fan out all misses at once; the semaphore bounds in-flight requests
+                    concurrency = min(self._api_concurrency(provider), provider_config['rate_limit'])
+                    semaphore = asyncio.Semaphore(max(1, concurrency))
+                    started = time.monotonic()
+                    api_results = {}
+                    
+                    def throttled() -> bool:
+                        return IPGeolocationService._throttled_at.get(provider, 0.0) >= started
+                    
+                    async def get_single_location(ip) -> bool:
+                        """Resolve one IP; True once the provider has rate limited this fan-out"""
+                        async with semaphore:
+                            if throttled():
+                                return True
+                            try:
+                                location = await self._query_api_location(ip)
+                            except Exception as e:
+                                logger.debug(f"API lookup failed for {ip}: {e}")
+                                return False
+                        if location:
+                            api_results[ip] = location
+                        return throttled()
+                    
+                    tasks = [asyncio.ensure_future(get_single_location(ip)) for ip in uncached_ips]
+                    try:
+                        for next_done in asyncio.as_completed(tasks):
+                            if await next_done:
+                                # Rate limited: the remaining IPs take the fallback instead of more requests
+                                logger.warning(f"Rate limited by {provider}; skipping "
+                                               f"{len(uncached_ips) - len(api_results)} remaining API lookups")
+                                break
+                    finally:
+                        for task in tasks:
+                            task.cancel()
+                    
+                    locations = await self._store_api_results(uncached_ips, api_results)
+                    self._settle_inflight(inflight, owned, locations)
+                    for item in locations.items():
+                        yield item
+            finally:
+                # Lookups cut short leave their waiters with no location rather than hanging
+                self._settle_inflight(inflight, owned, dict.fromkeys(uncached_ips))
         else:
             # For large number of IPs, use fallback fast scheme
             logger.info(f"Using fallback for {len(uncached_ips)} uncached IPs to improve performance")
             for ip in uncached_ips:
-                results[ip] = {
-                    'ip': ip,
-                    'country': 'Internet',
-                    'countryCode': 'IN',
-                    'region': 'External',
-                    'city': 'Internet',
-                    'lat': None,
-                    'lon': None,
-                    'isp': 'Internet Service',
-                    'org': 'External Network',
-                    'cached': False,
-                    'source': 'fallback_fast'
-                }
-        
-        return results
+                yield ip, {'ip': ip, **_FAST_FALLBACK_LOCATION}
+    
+    async def _store_api_results(self, ip_addresses: List[str],
+                                 api_results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Fall back for IPs the API missed, then write every new location in one statement"""
+        new_locations = {}
+        for ip in ip_addresses:
+            location = api_results.get(ip) or self._fallback_location(ip)
+            self._memory_cache_put(ip, location)
+            new_locations[ip] = location
+        await self._cache_locations_bulk(new_locations)
+        return new_locations
+    
+    def _schedule_stale_refresh(self, ip_addresses: List[str]):
+        """Re-resolve stale cache rows in the background while callers use the stale data"""
+        cls = IPGeolocationService
+        ips = [ip for ip in ip_addresses if ip not in cls._refreshing_ips]
+        if not ips:
+            return
+        cls._refreshing_ips.update(ips)
+        task = asyncio.get_running_loop().create_task(self._refresh_stale_locations(ips))
+        # Keep a strong reference until the task finishes
+        cls._refresh_tasks.add(task)
+        task.add_done_callback(cls._refresh_tasks.discard)
+    
+    async def _refresh_stale_locations(self, ip_addresses: List[str]):
+        """Query the provider for stale IPs; only answers it actually located are written back"""
+        try:
+            provider = self.current_provider
+            if self._supports_batch(provider):
+                batch_size = self.providers[provider]['batch_size']
+                refreshed = {}
+                for i in range(0, len(ip_addresses), batch_size):
+                    refreshed.update(
+                        await self._query_api_location_batch(ip_addresses[i:i + batch_size], provider)
+                    )
+            else:
+                refreshed = {}
+                for ip in ip_addresses:
+                    location = await self._query_api_location(ip)
+                    if location:
+                        refreshed[ip] = location
+            
+            # The upsert keeps a richer existing row's data over a poorer answer, but still
+            # bumps last_updated so the row is not refreshed again straight away
+            await self._cache_locations_bulk(refreshed)
+            for ip, location in refreshed.items():
+                self._memory_cache_put(ip, location)
+            logger.debug(f"Refreshed {len(refreshed)} of {len(ip_addresses)} stale cached locations")
+        except Exception as e:
+            logger.warning(f"Error refreshing stale cached locations: {e}")
+        finally:
+            IPGeolocationService._refreshing_ips.difference_update(ip_addresses)
     
     async def _batch_get_cached_locations(self, ip_addresses: List[str]) -> Dict[str, Dict[str, Any]]:
         """Batch get cached geolocation information"""
         if not ip_addresses:
             return {}
         
+        chunk_size = self.cache_lookup_chunk_size
+        if len(ip_addresses) > chunk_size:
+            # Spread very large lists over several pool connections
+            chunks = await asyncio.gather(*(
+                self._batch_get_cached_locations(ip_addresses[i:i + chunk_size])
+                for i in range(0, len(ip_addresses), chunk_size)
+            ))
+            cached_results = {}
+            for chunk in chunks:
+                cached_results.update(chunk)
+            return cached_results
+        
         try:
-            # Build IN query
-            ip_placeholders = ','.join(f'${i+1}' for i in range(len(ip_addresses)))
-            query = f"""
-            SELECT ip_address, country_code, country_name, region, city, 
-                   latitude, longitude, isp, organization, last_updated
-            FROM ip_geolocation_cache 
-            WHERE ip_address IN ({ip_placeholders})
-            AND last_updated > ${len(ip_addresses) + 1}
-            """
+            # Single array parameter keeps the statement text constant; large lists
+            # are joined against unnest() so the planner can hash/merge the keys.
+            # Rows past the cache duration are returned flagged stale rather than dropped
+            if len(ip_addresses) > self.cache_lookup_join_threshold:
+                query = """
+                SELECT host(c.ip_address) AS ip_address, c.country_code, c.country_name, c.region, c.city,
+                       c.latitude, c.longitude, c.isp, c.organization, c.last_updated,
+                       c.last_updated <= $2 AS stale
+                FROM ip_geolocation_cache c
+                JOIN unnest($1::inet[]) AS k(ip) ON c.ip_address = k.ip
+                """
+            else:
+                query = """
+                SELECT host(ip_address) AS ip_address, country_code, country_name, region, city,
+                       latitude, longitude, isp, organization, last_updated,
+                       last_updated <= $2 AS stale
+                FROM ip_geolocation_cache
+                WHERE ip_address = ANY($1::inet[])
+                """
             
-            cutoff_time = datetime.now() - timedelta(hours=self.cache_duration_hours)
-            params = tuple(ip_addresses) + (cutoff_time,)
+            cutoff_time = self._cache_cutoff()
             
-            result = await self.db_manager.execute_query(query, params)
+            result = await self.db_manager.execute_query(query, (ip_addresses, cutoff_time))
             
+            # Country names are standardized before they are cached, so rows are used as stored
             cached_results = {}
             for row in result:
                 ip_address = row['ip_address']
@@ -830,7 +1802,8 @@ class IPGeolocationService:
                     'lon': float(row['longitude']) if row['longitude'] else None,
                     'isp': row['isp'],
                     'org': row['organization'],
-                    'cached': True
+                    'cached': True,
+                    'stale': row['stale']
                 }
             
             return cached_results
@@ -842,42 +1815,43 @@ class IPGeolocationService:
     async def get_location_statistics(self, experiment_id: str) -> Dict[str, Any]:
         """Get geolocation statistics for all IPs in an experiment"""
         try:
-            # Get all unique IPs in the experiment
+            # Get all unique IPs in the experiment; GROUP BY can aggregate in parallel workers,
+            # and the cursor streams them as text without building a dict per row
             query = """
-            SELECT DISTINCT dst_ip as ip_address
+            SELECT host(dst_ip) as ip_address
             FROM packet_flows 
             WHERE experiment_id = $1 
             AND dst_ip IS NOT NULL 
             AND dst_ip != '0.0.0.0'::inet
-            AND NOT (HOST(dst_ip) LIKE '192.168.%' OR HOST(dst_ip) LIKE '10.%' OR HOST(dst_ip) LIKE '172.%')
+            AND NOT (dst_ip << inet '10.0.0.0/8' OR dst_ip << inet '172.16.0.0/12' OR dst_ip << inet '192.168.0.0/16')
+            GROUP BY dst_ip
             """
             
-            result = await self.db_manager.execute_query(query, (experiment_id,))
-            unique_ips = [row['ip_address'] for row in result]
+            unique_ips = [
+                record['ip_address']
+                async for record in self.db_manager.iter_query(query, (experiment_id,))
+            ]
             
-            # Batch get geolocation information
-            locations = await self.bulk_get_locations(unique_ips)
+            # Stream geolocation results; only the country/city keys are kept for counting
+            countries = []
+            city_keys = []
+            async for _, location in self.iter_locations(unique_ips):
+                country = location.get('country', 'Unknown')
+                countries.append(country)
+                city_keys.append(f"{location.get('city', 'Unknown')}, {country}")
             
             # Count country distribution
-            country_stats = {}
-            city_stats = {}
+            country_stats = Counter(countries)
+            city_stats = Counter(city_keys)
             total_ips = len(unique_ips)
-            located_ips = len(locations)
-            
-            for ip, location in locations.items():
-                country = location.get('country', 'Unknown')
-                city = location.get('city', 'Unknown')
-                
-                country_stats[country] = country_stats.get(country, 0) + 1
-                city_key = f"{city}, {country}"
-                city_stats[city_key] = city_stats.get(city_key, 0) + 1
+            located_ips = len(countries)
             
             return {
                 'total_unique_ips': total_ips,
                 'located_ips': located_ips,
                 'location_coverage': (located_ips / total_ips * 100) if total_ips > 0 else 0,
-                'country_distribution': dict(sorted(country_stats.items(), key=lambda x: x[1], reverse=True)),
-                'city_distribution': dict(sorted(city_stats.items(), key=lambda x: x[1], reverse=True)[:20])  # Top 20 cities
+                'country_distribution': dict(country_stats.most_common()),
+                'city_distribution': dict(city_stats.most_common(20))  # Top 20 cities
             }
             
         except Exception as e:
@@ -12,7 +12,7 @@ import uuid
 import time
 import sys
 import os
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, AsyncIterator
 from datetime import datetime
 from pathlib import Path
 
@@ -138,7 +138,8 @@ class PostgreSQLDatabaseManager:
             'max_size': get_config('database.pool.max_size', 20, 'database.pool'),
             'command_timeout': get_config('database.pool.command_timeout', 60, 'database.pool'),
             'acquire_timeout': get_config('database.pool.acquire_timeout', 30, 'database.pool'),
-            'idle_timeout': get_config('database.pool.idle_timeout', 300, 'database.pool')
+            'idle_timeout': get_config('database.pool.idle_timeout', 300, 'database.pool'),
+            'statement_cache_size': get_config('database.pool.statement_cache_size', 1024, 'database.pool')
         }
     
     def _load_server_settings(self) -> Dict[str, str]:
@@ -195,7 +196,8 @@ class PostgreSQLDatabaseManager:
             
             # Remove extra configuration items, only keep asyncpg needed
             pool_kwargs.pop('acquire_timeout', None)
-            pool_kwargs.pop('idle_timeout', None)
+            # Idle connections are recycled after idle_timeout seconds
+            pool_kwargs['max_inactive_connection_lifetime'] = pool_kwargs.pop('idle_timeout', 300)
             
             # Docker environment retry logic
             is_docker = self._is_docker_environment()
@@ -333,6 +335,33 @@ class PostgreSQLDatabaseManager:
             logger.error(f"Params: {params}")
             raise
     
+    async def iter_query(self, query: str, params: tuple = None,
+                         prefetch: int = 10000) -> AsyncIterator[asyncpg.Record]:
+        """
+        Stream SELECT results through a server-side cursor, prefetch rows at a time.
+        Records are yielded as-is (no type conversion); the connection is held until iteration ends
+        """
+        if not self.is_initialized or not self.pool:
+            raise RuntimeError(get_log_message('database', 'not_initialized', component='database.connection'))
+        
+        self._start_query_timer()
+        
+        try:
+            async with self.pool.acquire() as conn:
+                # Cursors only exist inside a transaction
+                async with conn.transaction():
+                    async for record in conn.cursor(query, *(params or ()), prefetch=prefetch):
+                        yield record
+                
+                self._check_query_performance(query)
+                
+        except Exception as e:
+            logger.error(get_log_message('database', 'query_execution_failed', component='database.connection',
+                                       error=str(e)))
+            logger.error(f"Query: {query}")
+            logger.error(f"Params: {params}")
+            raise
+    
     async def execute_scalar(self, query: str, params: tuple = None) -> Any:
         """Execute query and return single scalar value"""
         if not self.is_initialized or not self.pool:
@@ -429,6 +458,41 @@ class PostgreSQLDatabaseManager:
             logger.error(f"Table: {table}, Columns: {columns}")
             raise
     
+    async def bulk_upsert(self, table: str, columns: List[str], data: List[tuple], conflict_clause: str) -> int:
+        """COPY rows into a temporary staging table, then merge them with INSERT ... SELECT <conflict_clause>"""
+        if not self.is_initialized or not self.pool:
+            raise RuntimeError(get_log_message('database', 'not_initialized', component='database.connection'))
+        
+        if not data:
+            return 0
+        
+        staging = f"_staging_{table}"
+        column_list = ', '.join(columns)
+        
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    # Same column types as the target, no constraints or defaults; dropped on commit
+                    await conn.execute(
+                        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                        f"SELECT {column_list} FROM {table} WITH NO DATA"
+                    )
+                    await conn.copy_records_to_table(staging, records=data, columns=columns)
+                    await conn.execute(
+                        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} {conflict_clause}"
+                    )
+                
+                count = len(data)
+                logger.info(get_log_message('database', 'bulk_insert_completed', component='database.connection',
+                                          count=count, table=table))
+                return count
+                
+        except Exception as e:
+            logger.error(get_log_message('database', 'bulk_insert_failed', component='database.connection',
+                                       error=str(e)))
+            logger.error(f"Table: {table}, Columns: {columns}")
+            raise
+    
     async def get_table_stats(self) -> Dict[str, int]:
         """Get configured table statistics"""
         # Get monitored table list from config
@@ -46,7 +46,11 @@ CREATE TABLE IF NOT EXISTS network_flow_aggregates (
 );
 
 -- Create indexes for geolocation performance
-CREATE INDEX IF NOT EXISTS idx_ip_geolocation_ip ON ip_geolocation_cache(ip_address);
+-- Covering index: cache lookups by ip_address are answered by index-only scans.
+-- It replaces the plain ip_address index; uniqueness stays with the column's UNIQUE constraint
+DROP INDEX IF EXISTS idx_ip_geolocation_ip;
+CREATE INDEX IF NOT EXISTS idx_ip_geolocation_ip_covering ON ip_geolocation_cache(ip_address)
+    INCLUDE (country_code, country_name, region, city, latitude, longitude, isp, organization, last_updated);
 CREATE INDEX IF NOT EXISTS idx_ip_geolocation_country ON ip_geolocation_cache(country_code);
 CREATE INDEX IF NOT EXISTS idx_ip_geolocation_updated ON ip_geolocation_cache(last_updated);
 CREATE INDEX IF NOT EXISTS idx_ip_geolocation_coordinates ON ip_geolocation_cache(latitude, longitude) 
@@ -145,7 +149,7 @@ BEGIN
     WHERE pf.experiment_id = p_experiment_id
       AND pf.dst_ip IS NOT NULL 
       AND pf.dst_ip != '0.0.0.0'
-      AND NOT (pf.dst_ip::text LIKE '192.168.%' OR pf.dst_ip::text LIKE '10.%' OR pf.dst_ip::text LIKE '172.%')
+      AND NOT (pf.dst_ip << inet '10.0.0.0/8' OR pf.dst_ip << inet '172.16.0.0/12' OR pf.dst_ip << inet '192.168.0.0/16')
     GROUP BY pf.experiment_id, d.device_type, d.manufacturer, gc.country_name;
     
     GET DIAGNOSTICS affected_rows = ROW_COUNT;
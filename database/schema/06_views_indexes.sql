@@ -124,7 +124,7 @@ FROM packet_flows pf
 JOIN ip_geolocation_cache gc ON pf.dst_ip = gc.ip_address
 WHERE pf.dst_ip IS NOT NULL 
 AND pf.dst_ip != '0.0.0.0'
-AND NOT (pf.dst_ip::text LIKE '192.168.%' OR pf.dst_ip::text LIKE '10.%' OR pf.dst_ip::text LIKE '172.%')
+AND NOT (pf.dst_ip << inet '10.0.0.0/8' OR pf.dst_ip << inet '172.16.0.0/12' OR pf.dst_ip << inet '192.168.0.0/16')
 GROUP BY pf.experiment_id, gc.country_name, gc.country_code
 ORDER BY pf.experiment_id, total_bytes DESC;
 
@@ -200,6 +200,9 @@ CREATE INDEX IF NOT EXISTS idx_packet_flows_device_protocol_time
 CREATE INDEX IF NOT EXISTS idx_packet_flows_experiment_direction_time 
     ON packet_flows(experiment_id, flow_direction, packet_timestamp DESC);
 
+CREATE INDEX IF NOT EXISTS idx_packet_flows_device_experiment 
+    ON packet_flows(device_id, experiment_id);
+
 CREATE INDEX IF NOT EXISTS idx_devices_experiment_type_status 
     ON devices(experiment_id, device_type, status);
 
@@ -216,11 +219,19 @@ CREATE INDEX IF NOT EXISTS idx_device_traffic_experiment_pattern_time
     ON device_traffic_trend(experiment_id, pattern, timestamp DESC);
 
 -- Specialized indexes for geolocation queries
-CREATE INDEX IF NOT EXISTS idx_packet_flows_dst_ip_public 
+-- Public destination IPs; the predicate matches the RFC 1918 containment filter the
+-- geolocation queries use. It replaces idx_packet_flows_dst_ip_public, whose text LIKE
+-- predicate also excluded public 172.x addresses and no query could use any more
+DROP INDEX IF EXISTS idx_packet_flows_dst_ip_public;
+CREATE INDEX IF NOT EXISTS idx_packet_flows_dst_ip_global 
     ON packet_flows(dst_ip) 
     WHERE dst_ip IS NOT NULL 
-      AND dst_ip != '0.0.0.0'
-      AND NOT (dst_ip::text LIKE '192.168.%' OR dst_ip::text LIKE '10.%' OR dst_ip::text LIKE '172.%');
+      AND dst_ip != '0.0.0.0'::inet
+      AND NOT (dst_ip << inet '10.0.0.0/8' OR dst_ip << inet '172.16.0.0/12' OR dst_ip << inet '192.168.0.0/16');
+
+-- Subnet containment (<<) on destination IPs for private-range filters
+CREATE INDEX IF NOT EXISTS idx_packet_flows_dst_ip_gist 
+    ON packet_flows USING gist (dst_ip inet_ops);
 
 -- Partial indexes for active data
 CREATE INDEX IF NOT EXISTS idx_devices_active_experiment 